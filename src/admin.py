@@ -2,12 +2,74 @@ import argparse
 import csv
 import os
 import sqlite3
+import sys
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta, timezone
-
-
-def _connect(db_path: str) -> sqlite3.Connection:
-    conn = sqlite3.connect(db_path)
+from functools import cache
+from itertools import islice
+from typing import Iterable
+
+
+_WRITE_COMMANDS = frozenset({"clear-notifications", "remove-subs", "refresh-reference"})
+_SCHEMA_VERSION = 1
+_MAX_SQL_VARIABLES = 900
+_DELETE_BATCH_SIZE = 5000
+_PRINT_BATCH_LINES = 1000
+_STATUS_GUILD_LIMIT = 20
+_ANALYSIS_LIMIT = 1000
+_EXPORT_FETCH_SIZE = 10000
+_EXPORT_BUFFER_SIZE = 1 << 20
+_SUBS_FILTERS = {
+    "guild": ("guild_id = ?", str),
+    "user": ("user_id = ?", str),
+    "type": ("type = ?", str),
+    "code": ("code = ?", str.upper),
+}
+_RECENT_FILTERS = {
+    "subscription": ("subscription_id = ?", int),
+}
+_REFERENCE_TABLE_COLUMNS = {
+    "reference_airports": '''
+        icao TEXT PRIMARY KEY,
+        iata TEXT,
+        name TEXT NOT NULL,
+        city TEXT,
+        place_code TEXT,
+        lat REAL,
+        lon REAL,
+        alt REAL,
+        raw_json TEXT
+    ''',
+    "reference_models": '''
+        icao TEXT PRIMARY KEY,
+        manufacturer TEXT,
+        name TEXT NOT NULL,
+        raw_json TEXT
+    ''',
+}
+
+
+class _AdminConnection(sqlite3.Connection):
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self.table_columns: dict[str, set[str]] = {}
+
+
+def _connect(db_path: str, write: bool = False) -> sqlite3.Connection:
+    conn = sqlite3.connect(
+        db_path,
+        factory=_AdminConnection,
+        isolation_level=None,
+        cached_statements=256,
+    )
     conn.row_factory = sqlite3.Row
+    if write:
+        conn.execute("PRAGMA journal_mode = WAL")
+    conn.execute("PRAGMA synchronous = NORMAL")
+    conn.execute("PRAGMA temp_store = MEMORY")
+    conn.execute("PRAGMA cache_size = -64000")
+    conn.execute("PRAGMA mmap_size = 268435456")
+    _bootstrap_schema(conn)
     return conn
 
 
@@ -19,28 +81,121 @@ def _default_log_dir() -> str:
     return os.getenv("LOG_DIR", "/data/logs")
 
 
-def _print_rows(rows: list[sqlite3.Row], columns: list[str]) -> None:
-    if not rows:
+def _compile_filter_queries(select: str, filters: dict, suffix: str) -> dict[int, str]:
+    clauses = [clause for clause, _ in filters.values()]
+    queries = {}
+    for mask in range(1 << len(clauses)):
+        conditions = [clause for bit, clause in enumerate(clauses) if mask & (1 << bit)]
+        where = " WHERE " + " AND ".join(conditions) if conditions else ""
+        queries[mask] = f"{select}{where}{suffix}"
+    return queries
+
+
+def _filter_mask(args: argparse.Namespace, filters: dict) -> tuple[int, list]:
+    mask = 0
+    params = []
+    for bit, (name, (_, transform)) in enumerate(filters.items()):
+        value = getattr(args, name)
+        if value:
+            mask |= 1 << bit
+            params.append(transform(value))
+    return mask, params
+
+
+_SUBS_QUERIES = _compile_filter_queries(
+    "SELECT id, guild_id, guild_name, user_id, user_name, type, code, created_at "
+    "FROM subscriptions",
+    _SUBS_FILTERS,
+    " ORDER BY created_at DESC",
+)
+_RECENT_QUERIES = _compile_filter_queries(
+    "SELECT id, subscription_id, flight_id, notified_at FROM notification_log",
+    _RECENT_FILTERS,
+    " ORDER BY notified_at DESC LIMIT ?",
+)
+
+
+def _print_rows(rows: Iterable[sqlite3.Row], columns: list[str]) -> None:
+    indexes: list[int] = []
+    widths = [len(col) for col in columns]
+    cells = []
+    for row in rows:
+        if not indexes:
+            names = row.keys()
+            indexes = [names.index(col) for col in columns]
+        values = [str(row[idx]) for idx in indexes]
+        for pos, value in enumerate(values):
+            if len(value) > widths[pos]:
+                widths[pos] = len(value)
+        cells.append(values)
+    if not cells:
         print("No results.")
         return
-    widths = {col: len(col) for col in columns}
-    for row in rows:
-        for col in columns:
-            widths[col] = max(widths[col], len(str(row[col])))
-    header = "  ".join(col.ljust(widths[col]) for col in columns)
-    print(header)
-    print("-" * len(header))
-    for row in rows:
-        print("  ".join(str(row[col]).ljust(widths[col]) for col in columns))
+    fmt = "  ".join(f"{{:<{width}}}" for width in widths)
+    header = fmt.format(*columns)
+    lines = [header, "-" * len(header)]
+    for values in cells:
+        lines.append(fmt.format(*values))
+        if len(lines) >= _PRINT_BATCH_LINES:
+            sys.stdout.write("\n".join(lines) + "\n")
+            lines.clear()
+    if lines:
+        sys.stdout.write("\n".join(lines) + "\n")
+
+
+def _print_rows_streaming(cur: sqlite3.Cursor, columns: list[str]) -> None:
+    first = cur.fetchone()
+    if first is None:
+        print("No results.")
+        return
+    names = first.keys()
+    indexes = [names.index(col) for col in columns]
+    values = [str(first[idx]) for idx in indexes]
+    fmt = "  ".join(
+        f"{{!s:<{max(len(col), len(value))}}}" for col, value in zip(columns, values)
+    )
+    header = fmt.format(*columns)
+    lines = [header, "-" * len(header), fmt.format(*values)]
+    for row in cur:
+        lines.append(fmt.format(*[row[idx] for idx in indexes]))
+        if len(lines) >= _PRINT_BATCH_LINES:
+            sys.stdout.write("\n".join(lines) + "\n")
+            lines.clear()
+    if lines:
+        sys.stdout.write("\n".join(lines) + "\n")
+
+
+def _insert_many(
+    conn: sqlite3.Connection, table: str, columns: tuple[str, ...], params
+) -> int:
+    chunk_size = _MAX_SQL_VARIABLES // len(columns)
+    row_sql = "(" + ", ".join("?" for _ in columns) + ")"
+    prefix = f"INSERT INTO {table} ({', '.join(columns)}) VALUES "
+    chunk_sql = prefix + ", ".join([row_sql] * chunk_size)
+    rows = iter(params)
+    inserted = 0
+    while True:
+        chunk = list(islice(rows, chunk_size))
+        if not chunk:
+            return inserted
+        inserted += len(chunk)
+        if len(chunk) == chunk_size:
+            sql = chunk_sql
+        else:
+            sql = prefix + ", ".join([row_sql] * len(chunk))
+        conn.execute(sql, [value for row in chunk for value in row])
 
 
-def _ensure_column(conn: sqlite3.Connection, table: str, column: str, col_type: str) -> None:
-    rows = conn.execute(f"PRAGMA table_info({table})").fetchall()
-    existing = {row["name"] for row in rows}
+def _ensure_column(conn: _AdminConnection, table: str, column: str, col_type: str) -> None:
+    existing = conn.table_columns.get(table)
+    if existing is None:
+        rows = conn.execute(f"PRAGMA table_info({table})").fetchall()
+        existing = {row["name"] for row in rows}
+        conn.table_columns[table] = existing
     if column in existing:
         return
     conn.execute(f"ALTER TABLE {table} ADD COLUMN {column} {col_type}")
-    conn.commit()
+    existing.add(column)
 
 
 def _ensure_core_columns(conn: sqlite3.Connection) -> None:
@@ -57,36 +212,19 @@ def _ensure_core_columns(conn: sqlite3.Connection) -> None:
     _ensure_column(conn, "subscriptions", "user_name", "TEXT")
 
 
-def _ensure_reference_tables(conn: sqlite3.Connection) -> None:
+def _create_reference_table(conn: sqlite3.Connection, dataset_table: str, name: str) -> None:
     conn.execute(
-        '''
-        CREATE TABLE IF NOT EXISTS reference_airports (
-            icao TEXT PRIMARY KEY,
-            iata TEXT,
-            name TEXT NOT NULL,
-            city TEXT,
-            place_code TEXT,
-            lat REAL,
-            lon REAL,
-            alt REAL,
-            raw_json TEXT
-        )
-        '''
+        f"CREATE TABLE IF NOT EXISTS {name} ({_REFERENCE_TABLE_COLUMNS[dataset_table]})"
     )
+
+
+def _ensure_reference_tables(conn: sqlite3.Connection) -> None:
+    _create_reference_table(conn, "reference_airports", "reference_airports")
     _ensure_column(conn, "reference_airports", "lat", "REAL")
     _ensure_column(conn, "reference_airports", "lon", "REAL")
     _ensure_column(conn, "reference_airports", "alt", "REAL")
     _ensure_column(conn, "reference_airports", "raw_json", "TEXT")
-    conn.execute(
-        '''
-        CREATE TABLE IF NOT EXISTS reference_models (
-            icao TEXT PRIMARY KEY,
-            manufacturer TEXT,
-            name TEXT NOT NULL,
-            raw_json TEXT
-        )
-        '''
-    )
+    _create_reference_table(conn, "reference_models", "reference_models")
     _ensure_column(conn, "reference_models", "raw_json", "TEXT")
     conn.execute(
         '''
@@ -98,7 +236,6 @@ def _ensure_reference_tables(conn: sqlite3.Connection) -> None:
         )
         '''
     )
-    conn.commit()
 
 
 def _ensure_credits_table(conn: sqlite3.Connection) -> None:
@@ -130,7 +267,6 @@ def _ensure_credits_table(conn: sqlite3.Connection) -> None:
     _ensure_column(conn, "fr24_key_credits", "parked_at", "TEXT")
     _ensure_column(conn, "fr24_key_credits", "parked_reason", "TEXT")
     _ensure_column(conn, "fr24_key_credits", "parked_notified_at", "TEXT")
-    conn.commit()
 
 
 def _ensure_bot_settings_table(conn: sqlite3.Connection) -> None:
@@ -143,7 +279,6 @@ def _ensure_bot_settings_table(conn: sqlite3.Connection) -> None:
         )
         '''
     )
-    conn.commit()
 
 
 def _ensure_typecard_tables(conn: sqlite3.Connection) -> None:
@@ -165,15 +300,79 @@ def _ensure_typecard_tables(conn: sqlite3.Connection) -> None:
             ON typecard_notification_log (notified_at)
         '''
     )
-    conn.commit()
 
 
-def cmd_status(conn: sqlite3.Connection) -> None:
-    _ensure_core_columns(conn)
-    _ensure_reference_tables(conn)
-    _ensure_credits_table(conn)
-    _ensure_bot_settings_table(conn)
-    _ensure_typecard_tables(conn)
+def _ensure_query_indexes(conn: sqlite3.Connection) -> None:
+    conn.execute(
+        '''
+        CREATE INDEX IF NOT EXISTS idx_subscriptions_type_code
+            ON subscriptions (type, code)
+        '''
+    )
+    conn.execute(
+        '''
+        CREATE INDEX IF NOT EXISTS idx_notification_log_notified_at
+            ON notification_log (notified_at)
+        '''
+    )
+    conn.execute(
+        '''
+        CREATE INDEX IF NOT EXISTS idx_notification_log_subscription_notified_at
+            ON notification_log (subscription_id, notified_at DESC)
+        '''
+    )
+
+
+def _bootstrap_schema(conn: _AdminConnection) -> None:
+    if conn.execute("PRAGMA user_version").fetchone()[0] >= _SCHEMA_VERSION:
+        return
+    core_tables = conn.execute(
+        '''
+        SELECT COUNT(*) FROM sqlite_master
+        WHERE type = 'table' AND name IN ('guild_settings', 'subscriptions')
+        '''
+    ).fetchone()[0]
+    try:
+        with conn:
+            conn.execute("BEGIN IMMEDIATE")
+            _ensure_reference_tables(conn)
+            _ensure_credits_table(conn)
+            _ensure_bot_settings_table(conn)
+            _ensure_typecard_tables(conn)
+            if core_tables < 2:
+                # The bot has not created its core tables yet; finish the migration later.
+                return
+            _ensure_core_columns(conn)
+            _ensure_query_indexes(conn)
+            conn.execute(f"PRAGMA user_version = {_SCHEMA_VERSION}")
+    except sqlite3.OperationalError as exc:
+        conn.table_columns.clear()
+        if exc.sqlite_errorname != "SQLITE_READONLY":
+            raise
+
+
+def _approximate_counts(conn: sqlite3.Connection, tables: Iterable[str]) -> dict[str, int]:
+    tables = tuple(tables)
+    try:
+        conn.execute(f"PRAGMA analysis_limit = {_ANALYSIS_LIMIT}")
+        for table in tables:
+            conn.execute(f"ANALYZE {table}")
+    except sqlite3.Error:
+        # Stale statistics are worse than none; fall back to exact counts.
+        return {}
+    counts: dict[str, int] = {}
+    for row in conn.execute("SELECT tbl, stat FROM sqlite_stat1"):
+        if row["tbl"] not in tables:
+            continue
+        try:
+            value = int(str(row["stat"]).split()[0])
+        except (IndexError, ValueError):
+            continue
+        counts[row["tbl"]] = max(value, counts.get(row["tbl"], 0))
+    return counts
+
+
+def cmd_status(conn: sqlite3.Connection, args: argparse.Namespace) -> None:
     tables = (
         "guild_settings",
         "subscriptions",
@@ -187,12 +386,23 @@ def cmd_status(conn: sqlite3.Connection) -> None:
         "reference_models",
         "reference_meta",
     )
-    counts = {}
-    for table in tables:
-        cur = conn.execute(f"SELECT COUNT(*) AS count FROM {table}")
-        counts[table] = int(cur.fetchone()["count"])
+    approximate = {} if args.exact else _approximate_counts(conn, tables)
+    missing = [table for table in tables if table not in approximate]
+    totals: dict[str, int] = {}
+    if missing:
+        query = " UNION ALL ".join(
+            f"SELECT '{table}' AS name, COUNT(*) AS count FROM {table}"
+            for table in missing
+        )
+        totals = {row["name"]: int(row["count"]) for row in conn.execute(query)}
+    counts = {
+        table: f"{totals[table]}" if table in totals else f"~{approximate[table]}"
+        for table in tables
+    }
     print("Database:", conn.execute("PRAGMA database_list").fetchone()["file"])
     print("Counts:", ", ".join(f"{k}={v}" for k, v in counts.items()))
+    if not args.verbose:
+        return
 
     cur = conn.execute(
         '''
@@ -200,7 +410,9 @@ def cmd_status(conn: sqlite3.Connection) -> None:
                typecards_role_id, typecards_role_name, updated_at
         FROM guild_settings
         ORDER BY guild_id
-        '''
+        LIMIT ?
+        ''',
+        (args.limit,),
     )
     rows = cur.fetchall()
     if rows:
@@ -220,7 +432,6 @@ def cmd_status(conn: sqlite3.Connection) -> None:
 
 
 def cmd_reference_status(conn: sqlite3.Connection) -> None:
-    _ensure_reference_tables(conn)
     cur = conn.execute(
         "SELECT dataset, updated_at, fetched_at, row_count FROM reference_meta ORDER BY dataset"
     )
@@ -232,31 +443,40 @@ def cmd_reference_status(conn: sqlite3.Connection) -> None:
         print("No reference metadata found.")
 
 
+def _fetch_timed(fetch, *args):
+    result = fetch(*args)
+    return result, datetime.now(timezone.utc).isoformat()
+
+
 def cmd_refresh_reference(conn: sqlite3.Connection, args: argparse.Namespace) -> None:
     from .reference_data import (
+        fetch_reference_bytes_sync,
         fetch_reference_payload_sync,
-        parse_airports_payload,
+        iter_airports_payload,
         parse_models_payload,
     )
 
-    _ensure_reference_tables(conn)
-
     datasets = (args.dataset,) if args.dataset != "all" else ("airports", "models")
-    for dataset in datasets:
-        endpoint = "airports" if dataset == "airports" else "models"
-        payload = fetch_reference_payload_sync(
-            args.skycards_api_base, endpoint, args.skycards_client_version
-        )
-        fetched_at = datetime.now(timezone.utc).isoformat()
-        if dataset == "airports":
-            updated_at, rows = parse_airports_payload(payload)
-            conn.execute("DELETE FROM reference_airports")
-            conn.executemany(
-                '''
-                INSERT INTO reference_airports (icao, iata, name, city, place_code, lat, lon, alt, raw_json)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-                ''',
-                [
+    fetchers = {"airports": fetch_reference_bytes_sync, "models": fetch_reference_payload_sync}
+    with ThreadPoolExecutor(max_workers=len(datasets)) as pool:
+        futures = {
+            dataset: pool.submit(
+                _fetch_timed,
+                fetchers[dataset],
+                args.skycards_api_base,
+                dataset,
+                args.skycards_client_version,
+            )
+            for dataset in datasets
+        }
+        for dataset in datasets:
+            meta: dict = {}
+            if dataset == "airports":
+                data, fetched_at = futures[dataset].result()
+                rows = iter_airports_payload(data, meta)
+                table = "reference_airports"
+                columns = ("icao", "iata", "name", "city", "place_code", "lat", "lon", "alt", "raw_json")
+                params = (
                     (
                         row.get("icao"),
                         row.get("iata"),
@@ -269,18 +489,13 @@ def cmd_refresh_reference(conn: sqlite3.Connection, args: argparse.Namespace) ->
                         row.get("raw_json"),
                     )
                     for row in rows
-                ],
-            )
-            row_count = len(rows)
-        else:
-            updated_at, rows = parse_models_payload(payload)
-            conn.execute("DELETE FROM reference_models")
-            conn.executemany(
-                '''
-                INSERT INTO reference_models (icao, manufacturer, name, raw_json)
-                VALUES (?, ?, ?, ?)
-                ''',
-                [
+                )
+            else:
+                payload, fetched_at = futures[dataset].result()
+                meta["updated_at"], rows = parse_models_payload(payload)
+                table = "reference_models"
+                columns = ("icao", "manufacturer", "name", "raw_json")
+                params = (
                     (
                         row.get("icao"),
                         row.get("manufacturer"),
@@ -288,28 +503,40 @@ def cmd_refresh_reference(conn: sqlite3.Connection, args: argparse.Namespace) ->
                         row.get("raw_json"),
                     )
                     for row in rows
-                ],
+                )
+            with conn:
+                conn.execute("BEGIN IMMEDIATE")
+                shadow = f"{table}_new"
+                conn.execute(f"DROP TABLE IF EXISTS {shadow}")
+                _create_reference_table(conn, table, shadow)
+                row_count = _insert_many(conn, shadow, columns, params)
+                updated_at = meta["updated_at"]
+                conn.execute(f"DROP TABLE {table}")
+                conn.execute(f"ALTER TABLE {shadow} RENAME TO {table}")
+                if dataset == "airports":
+                    conn.execute(
+                        '''
+                        CREATE INDEX IF NOT EXISTS idx_reference_airports_iata
+                            ON reference_airports (iata)
+                        '''
+                    )
+                conn.execute(
+                    '''
+                    INSERT INTO reference_meta (dataset, updated_at, fetched_at, row_count)
+                    VALUES (?, ?, ?, ?)
+                    ON CONFLICT(dataset)
+                    DO UPDATE SET updated_at = excluded.updated_at,
+                                  fetched_at = excluded.fetched_at,
+                                  row_count = excluded.row_count
+                    ''',
+                    (dataset, updated_at, fetched_at, row_count),
+                )
+            print(
+                f"Refreshed {dataset}: {row_count} rows (updated_at={updated_at}, fetched_at={fetched_at})"
             )
-            row_count = len(rows)
-        conn.execute(
-            '''
-            INSERT INTO reference_meta (dataset, updated_at, fetched_at, row_count)
-            VALUES (?, ?, ?, ?)
-            ON CONFLICT(dataset)
-            DO UPDATE SET updated_at = excluded.updated_at,
-                          fetched_at = excluded.fetched_at,
-                          row_count = excluded.row_count
-            ''',
-            (dataset, updated_at, fetched_at, row_count),
-        )
-        conn.commit()
-        print(
-            f"Refreshed {dataset}: {row_count} rows (updated_at={updated_at}, fetched_at={fetched_at})"
-        )
 
 
 def cmd_guilds(conn: sqlite3.Connection) -> None:
-    _ensure_core_columns(conn)
     cur = conn.execute(
         '''
         SELECT guild_id, guild_name, notify_channel_id, notify_channel_name,
@@ -337,31 +564,9 @@ def cmd_guilds(conn: sqlite3.Connection) -> None:
 
 
 def cmd_subs(conn: sqlite3.Connection, args: argparse.Namespace) -> None:
-    _ensure_core_columns(conn)
-    query = (
-        '''
-        SELECT id, guild_id, guild_name, user_id, user_name, type, code, created_at
-        FROM subscriptions
-        WHERE 1=1
-        '''
-    )
-    params = []
-    if args.guild:
-        query += " AND guild_id = ?"
-        params.append(args.guild)
-    if args.user:
-        query += " AND user_id = ?"
-        params.append(args.user)
-    if args.type:
-        query += " AND type = ?"
-        params.append(args.type)
-    if args.code:
-        query += " AND code = ?"
-        params.append(args.code.upper())
-    query += " ORDER BY created_at DESC"
-    rows = conn.execute(query, params).fetchall()
+    mask, params = _filter_mask(args, _SUBS_FILTERS)
     _print_rows(
-        rows,
+        conn.execute(_SUBS_QUERIES[mask], params),
         [
             "id",
             "guild_id",
@@ -376,7 +581,6 @@ def cmd_subs(conn: sqlite3.Connection, args: argparse.Namespace) -> None:
 
 
 def cmd_subs_by_user(conn: sqlite3.Connection) -> None:
-    _ensure_core_columns(conn)
     rows = conn.execute(
         '''
         SELECT user_name, user_id, COUNT(*) AS subs
@@ -389,27 +593,34 @@ def cmd_subs_by_user(conn: sqlite3.Connection) -> None:
 
 
 def cmd_recent(conn: sqlite3.Connection, args: argparse.Namespace) -> None:
-    query = (
-        "SELECT id, subscription_id, flight_id, notified_at FROM notification_log WHERE 1=1"
-    )
-    params = []
-    if args.subscription:
-        query += " AND subscription_id = ?"
-        params.append(args.subscription)
-    query += " ORDER BY notified_at DESC LIMIT ?"
+    mask, params = _filter_mask(args, _RECENT_FILTERS)
     params.append(args.limit)
-    rows = conn.execute(query, params).fetchall()
-    _print_rows(rows, ["id", "subscription_id", "flight_id", "notified_at"])
+    _print_rows_streaming(
+        conn.execute(_RECENT_QUERIES[mask], params),
+        ["id", "subscription_id", "flight_id", "notified_at"],
+    )
 
 
 def cmd_clear_notifications(conn: sqlite3.Connection, args: argparse.Namespace) -> None:
     cutoff = datetime.now(timezone.utc) - timedelta(days=args.older_than_days)
-    cur = conn.execute(
-        "DELETE FROM notification_log WHERE notified_at < ?",
-        (cutoff.isoformat(),),
-    )
-    conn.commit()
-    print(f"Deleted {cur.rowcount} notification_log rows older than {args.older_than_days} days.")
+    deleted = 0
+    while True:
+        cur = conn.execute(
+            '''
+            DELETE FROM notification_log
+            WHERE rowid IN (
+                SELECT rowid FROM notification_log WHERE notified_at < ? LIMIT ?
+            )
+            ''',
+            (cutoff.isoformat(), _DELETE_BATCH_SIZE),
+        )
+        deleted += cur.rowcount
+        if cur.rowcount < _DELETE_BATCH_SIZE:
+            break
+    if deleted:
+        conn.execute("PRAGMA analysis_limit = 1000")
+        conn.execute("ANALYZE notification_log")
+    print(f"Deleted {deleted} notification_log rows older than {args.older_than_days} days.")
 
 
 def cmd_logs(args: argparse.Namespace) -> None:
@@ -442,57 +653,60 @@ def cmd_remove_subs(conn: sqlite3.Connection, args: argparse.Namespace) -> None:
         return
     print("Deleting subscriptions:")
     _print_rows(rows, ["id", "guild_id", "user_id", "type", "code"])
-    if args.yes:
-        to_delete = [row["id"] for row in rows]
-        placeholders = ",".join("?" for _ in to_delete)
-        cur = conn.execute(
-            f"DELETE FROM subscriptions WHERE id IN ({placeholders})",
-            to_delete,
-        )
-        conn.commit()
-        print(f"Deleted {cur.rowcount} subscriptions.")
-        return
-    confirm = input("Type DELETE to confirm: ").strip()
-    if confirm != "DELETE":
-        print("Aborted.")
-        return
-    to_delete = [row["id"] for row in rows]
-    placeholders = ",".join("?" for _ in to_delete)
+    if not args.yes:
+        confirm = input("Type DELETE to confirm: ").strip()
+        if confirm != "DELETE":
+            print("Aborted.")
+            return
     cur = conn.execute(
-        f"DELETE FROM subscriptions WHERE id IN ({placeholders})",
-        to_delete,
+        f"DELETE FROM subscriptions WHERE id IN ({placeholders}) RETURNING id",
+        ids,
     )
-    conn.commit()
-    print(f"Deleted {cur.rowcount} subscriptions.")
+    deleted = cur.fetchall()
+    print(f"Deleted {len(deleted)} subscriptions.")
 
 
 def cmd_export_subs(conn: sqlite3.Connection, args: argparse.Namespace) -> None:
-    _ensure_core_columns(conn)
     query = '''
         SELECT id, guild_id, guild_name, user_id, user_name, type, code, created_at
         FROM subscriptions
         ORDER BY created_at DESC
     '''
-    rows = conn.execute(query).fetchall()
-    writer = csv.writer(os.sys.stdout)
-    writer.writerow(
-        ["id", "guild_id", "guild_name", "user_id", "user_name", "type", "code", "created_at"]
-    )
-    for row in rows:
-        writer.writerow(
-            [
-                row["id"],
-                row["guild_id"],
-                row["guild_name"],
-                row["user_id"],
-                row["user_name"],
-                row["type"],
-                row["code"],
-                row["created_at"],
-            ]
-        )
-
-
+    cur = conn.execute(query)
+    sys.stdout.flush()
+    with open(
+        sys.stdout.fileno(),
+        "w",
+        buffering=_EXPORT_BUFFER_SIZE,
+        encoding=sys.stdout.encoding,
+        newline="",
+        closefd=False,
+    ) as out:
+        writer = csv.writer(out)
+        writer.writerow([column[0] for column in cur.description])
+        separators = len(cur.description) - 1
+        while True:
+            chunk = cur.fetchmany(_EXPORT_FETCH_SIZE)
+            if not chunk:
+                break
+            lines = []
+            for row in chunk:
+                line = ",".join("" if value is None else str(value) for value in row)
+                if (
+                    line.count(",") != separators
+                    or '"' in line
+                    or "\n" in line
+                    or "\r" in line
+                ):
+                    out.write("".join(lines))
+                    lines.clear()
+                    writer.writerow(row)
+                    continue
+                lines.append(line + "\r\n")
+            out.write("".join(lines))
+
+
+@cache
 def build_parser() -> argparse.ArgumentParser:
     parser = argparse.ArgumentParser(description="FR24 Discord bot admin CLI")
     parser.add_argument("--db", default=_default_db_path(), help="Path to SQLite DB")
@@ -510,7 +724,23 @@ def build_parser() -> argparse.ArgumentParser:
 
     sub = parser.add_subparsers(dest="command", required=True)
 
-    sub.add_parser("status", help="Show counts and notify channels")
+    status = sub.add_parser("status", help="Show counts and notify channels")
+    status.add_argument(
+        "--exact",
+        action="store_true",
+        help="Count rows with COUNT(*) instead of sqlite_stat1 estimates",
+    )
+    status.add_argument(
+        "--verbose",
+        action="store_true",
+        help="Also list guild notify channels",
+    )
+    status.add_argument(
+        "--limit",
+        type=int,
+        default=_STATUS_GUILD_LIMIT,
+        help="Max guilds listed with --verbose (negative for all)",
+    )
     sub.add_parser("guilds", help="List guild notify channels")
 
     subs = sub.add_parser("subs", help="List subscriptions")
@@ -551,12 +781,20 @@ def build_parser() -> argparse.ArgumentParser:
 
 
 def main() -> None:
-    parser = build_parser()
-    args = parser.parse_args()
-    conn = _connect(args.db)
+    if sys.argv[1:] == ["status"]:
+        args = argparse.Namespace(
+            db=_default_db_path(),
+            command="status",
+            exact=False,
+            verbose=False,
+            limit=_STATUS_GUILD_LIMIT,
+        )
+    else:
+        args = build_parser().parse_args()
+    conn = _connect(args.db, write=args.command in _WRITE_COMMANDS)
     try:
         if args.command == "status":
-            cmd_status(conn)
+            cmd_status(conn, args)
         elif args.command == "guilds":
             cmd_guilds(conn)
         elif args.command == "subs":
@@ -578,6 +816,12 @@ def main() -> None:
         elif args.command == "refresh-reference":
             cmd_refresh_reference(conn, args)
     finally:
+        try:
+            conn.execute(f"PRAGMA analysis_limit = {_ANALYSIS_LIMIT}")
+            conn.execute("PRAGMA optimize")
+        except sqlite3.Error:
+            # Read-only database files cannot store refreshed statistics.
+            pass
         conn.close()
 
 
@@ -1,3 +1,4 @@
+import asyncio
 import logging
 import os
 from logging.handlers import TimedRotatingFileHandler
@@ -6,7 +7,7 @@ import discord
 from discord import app_commands
 from dotenv import load_dotenv
 
-from .commands import setup_commands
+from .commands import Services, setup_commands
 from .config import load_config
 from .db import Database
 from .fr24.client import Fr24Client
@@ -59,9 +60,12 @@ class FlightBot(discord.Client):
     async def setup_hook(self) -> None:
         await self.db.connect()
         await self.db.init()
-        await self.reference_data.load_from_db()
+        reference_task = asyncio.create_task(self.reference_data.load_from_db())
+        stored_interval, stored_enabled = await asyncio.gather(
+            self.db.get_setting("poll_interval_seconds"),
+            self.db.get_setting("polling_enabled"),
+        )
         poll_interval = self.config.poll_interval_seconds
-        stored_interval = await self.db.get_setting("poll_interval_seconds")
         if stored_interval:
             try:
                 poll_interval = int(stored_interval)
@@ -69,20 +73,23 @@ class FlightBot(discord.Client):
                 logging.getLogger(__name__).warning(
                     "Invalid poll_interval_seconds setting: %s", stored_interval
                 )
-        stored_enabled = await self.db.get_setting("polling_enabled")
         polling_enabled = True
         if stored_enabled is not None:
             polling_enabled = stored_enabled.strip().lower() in ("1", "true", "yes", "on")
         self.poller_state = PollerState(polling_enabled, poll_interval)
         setup_commands(
-            self.tree,
-            self.db,
-            self.config,
-            self.fr24,
-            self.reference_data,
-            self.poller_state,
+            Services(
+                tree=self.tree,
+                db=self.db,
+                config=self.config,
+                fr24=self.fr24,
+                reference_data=self.reference_data,
+                poller_state=self.poller_state,
+            )
+        )
+        await asyncio.gather(
+            reference_task, run_startup_checks(self, self.db, self.config)
         )
-        await run_startup_checks(self, self.db, self.config)
         self.loop.create_task(
             poll_loop(
                 self,
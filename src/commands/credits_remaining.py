@@ -1,11 +1,21 @@
+import time
 from datetime import datetime, timezone
+from functools import lru_cache
 
 import discord
 
 
+_EMBED_TTL_SECONDS = 15.0
+
+
 def _parse_iso(value: str | None) -> datetime | None:
     if not value:
         return None
+    return _parse_iso_cached(value)
+
+
+@lru_cache(maxsize=1024)
+def _parse_iso_cached(value: str) -> datetime | None:
     try:
         parsed = datetime.fromisoformat(value)
     except ValueError:
@@ -19,25 +29,42 @@ def _format_timestamp(value: str | None) -> str | None:
     parsed = _parse_iso(value)
     if not parsed:
         return None
-    return parsed.strftime("%Y-%m-%d %H:%M UTC")
+    return f"<t:{int(parsed.timestamp())}:f>"
+
 
+def register(services) -> None:
+    tree = services.tree
+    db = services.db
+    config = services.config
+
+    cached: tuple[float, tuple, discord.Embed] | None = None
 
-def register(tree, db, config) -> None:
     @tree.command(
         name="credits-remaining",
         description="Show the latest FR24 credits remaining values.",
     )
     async def credits_remaining(interaction: discord.Interaction) -> None:
-        rows = await db.get_fr24_key_credits()
-        if not rows:
+        nonlocal cached
+        fingerprint = await db.get_fr24_key_credits_fingerprint()
+        if (
+            cached
+            and cached[1] == fingerprint
+            and time.monotonic() - cached[0] < _EMBED_TTL_SECONDS
+        ):
+            await interaction.response.send_message(embed=cached[2], ephemeral=True)
+            return
+
+        table = await db.get_fr24_key_credits_table()
+        if not table.suffixes:
             await interaction.response.send_message(
                 "No FR24 credits data yet. It updates after the next FR24 API call.",
                 ephemeral=True,
             )
             return
 
-        by_suffix = {row.get("key_suffix"): row for row in rows if row.get("key_suffix")}
+        index_by_suffix = {suffix: pos for pos, suffix in enumerate(table.suffixes)}
         embed = discord.Embed(title="FR24 Credits (per key)", color=discord.Color.blurple())
+        now = datetime.now(timezone.utc)
 
         keys = []
         for key in config.fr24_api_keys:
@@ -47,19 +74,19 @@ def register(tree, db, config) -> None:
 
         for idx, suffix in enumerate(keys, start=1):
             masked = f"***{suffix}"
-            row = by_suffix.get(suffix)
-            if not row:
+            pos = index_by_suffix.get(suffix)
+            if pos is None:
                 embed.add_field(
                     name=f"Key {idx} ({masked})",
                     value="No data yet",
                     inline=False,
                 )
                 continue
-            remaining = row.get("remaining")
-            consumed = row.get("consumed")
-            updated_at = _format_timestamp(row.get("updated_at"))
-            parked_until_dt = _parse_iso(row.get("parked_until"))
-            parked_reason = row.get("parked_reason")
+            remaining = table.remaining[pos]
+            consumed = table.consumed[pos]
+            updated_at = _format_timestamp(table.updated_at[pos])
+            parked_until_dt = _parse_iso(table.parked_until[pos])
+            parked_reason = table.parked_reason[pos]
             parts = []
             if remaining is not None:
                 parts.append(f"Remaining: {remaining}")
@@ -67,10 +94,8 @@ def register(tree, db, config) -> None:
                 parts.append(f"Consumed: {consumed}")
             if updated_at:
                 parts.append(f"Updated: {updated_at}")
-            if parked_until_dt and parked_until_dt > datetime.now(timezone.utc):
-                parts.append(
-                    f"Status: Parked until {parked_until_dt.strftime('%Y-%m-%d %H:%M UTC')}"
-                )
+            if parked_until_dt and parked_until_dt > now:
+                parts.append(f"Status: Parked until <t:{int(parked_until_dt.timestamp())}:f>")
                 if parked_reason:
                     parts.append(f"Reason: {parked_reason}")
             embed.add_field(
@@ -79,4 +104,5 @@ def register(tree, db, config) -> None:
                 inline=False,
             )
 
+        cached = (time.monotonic(), fingerprint, embed)
         await interaction.response.send_message(embed=embed, ephemeral=True)
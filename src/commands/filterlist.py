@@ -1,6 +1,11 @@
 import io
 import logging
-from typing import Callable
+import operator
+import re
+import sys
+from bisect import bisect_left, bisect_right
+from functools import lru_cache
+from typing import Callable, Iterator
 
 import discord
 from discord import app_commands
@@ -95,6 +100,7 @@ _FIELD_DEFS: dict[str, dict] = {
 
 _FIELD_ALIASES: dict[str, str] = {}
 for key, meta in _FIELD_DEFS.items():
+    meta["ops_set"] = frozenset(meta["ops"])
     _FIELD_ALIASES[key.lower()] = key
     _FIELD_ALIASES[meta["label"].lower()] = key
     _FIELD_ALIASES[meta["label"].lower().replace(" ", "")] = key
@@ -115,6 +121,38 @@ _OP_LABELS = {
     "is": "is (true/false)",
 }
 
+_OP_RESOLVE: dict[str, str] = {op: op for op in _OP_LABELS}
+_OP_RESOLVE.update({
+    "eq": "=",
+    "equals": "=",
+    "ne": "!=",
+    "not": "!=",
+    "lt": "<",
+    "lte": "<=",
+    "gt": ">",
+    "gte": ">=",
+    "range": "between",
+    "any": "has_any",
+    "all": "has_all",
+    "bool": "is",
+    "true": "is",
+    "false": "is",
+})
+
+_NUMBER_OPS: dict[str, Callable[[float, float], bool]] = {
+    "=": operator.eq,
+    "!=": operator.ne,
+    "<": operator.lt,
+    "<=": operator.le,
+    ">": operator.gt,
+    ">=": operator.ge,
+}
+
+_STR_OPS: dict[str, Callable[[str, str], bool]] = {
+    "=": operator.eq,
+    "!=": operator.ne,
+}
+
 _MANUFACTURER_AUTOCOMPLETE = (
     "3XTRIM",
     "ACRO SPORT",
@@ -353,12 +391,48 @@ _MANUFACTURER_AUTOCOMPLETE = (
     "ZIVKO",
 )
 
+_VALUE_AUTOCOMPLETE: dict[str, tuple[tuple[app_commands.Choice[str], str], ...]] = {
+    field_key: tuple(
+        (app_commands.Choice(name=value, value=value), value.lower()) for value in values
+    )
+    for field_key, values in (
+        ("cardCategory", _FIELD_DEFS["cardCategory"]["values"]),
+        ("military", ("true", "false")),
+        ("manufacturer", _MANUFACTURER_AUTOCOMPLETE),
+    )
+}
+
+_MANUFACTURER_PREFIX_INDEX = sorted(
+    _VALUE_AUTOCOMPLETE["manufacturer"], key=lambda entry: entry[1]
+)
+_MANUFACTURER_PREFIX_KEYS = [lowered for _, lowered in _MANUFACTURER_PREFIX_INDEX]
+
+
+def _manufacturer_matches(
+    current_lower: str, limit: int = 25
+) -> list[app_commands.Choice[str]]:
+    start = bisect_left(_MANUFACTURER_PREFIX_KEYS, current_lower)
+    end = bisect_right(_MANUFACTURER_PREFIX_KEYS, current_lower + "\uffff", lo=start)
+    matches = [choice for choice, _ in _MANUFACTURER_PREFIX_INDEX[start : min(end, start + limit)]]
+    if len(matches) < limit:
+        for choice, lowered in _VALUE_AUTOCOMPLETE["manufacturer"]:
+            if current_lower in lowered and not lowered.startswith(current_lower):
+                matches.append(choice)
+                if len(matches) >= limit:
+                    break
+    return matches
+
+
+def _normalize_token(value: str) -> str:
+    cleaned = value.strip()
+    return cleaned if cleaned.islower() else cleaned.lower()
+
 
 def _resolve_field_key(value) -> str | None:
     if isinstance(value, app_commands.Choice):
         return value.value
     if isinstance(value, str):
-        key = _FIELD_ALIASES.get(value.strip().lower())
+        key = _FIELD_ALIASES.get(_normalize_token(value))
         if key:
             return key
         if value in _FIELD_DEFS:
@@ -373,28 +447,7 @@ def _resolve_op(value: str | app_commands.Choice[str]) -> str | None:
         raw = value
     if not isinstance(raw, str):
         return None
-    cleaned = raw.strip().lower()
-    if cleaned in _OP_LABELS:
-        return cleaned
-    synonyms = {
-        "eq": "=",
-        "equals": "=",
-        "ne": "!=",
-        "not": "!=",
-        "lt": "<",
-        "lte": "<=",
-        "gt": ">",
-        "gte": ">=",
-        "range": "between",
-        "any": "has_any",
-        "all": "has_all",
-        "bool": "is",
-        "true": "is",
-        "false": "is",
-    }
-    if cleaned in synonyms:
-        return synonyms[cleaned]
-    return None
+    return _OP_RESOLVE.get(_normalize_token(raw))
 
 
 def _split_csv(value: str) -> list[str]:
@@ -412,17 +465,19 @@ def _parse_number(value: str) -> float | None:
 
 
 def _parse_range(value: str) -> tuple[float, float] | None:
-    cleaned = value.strip().replace(" ", "")
-    if ".." in cleaned:
-        parts = cleaned.split("..", 1)
-    elif "-" in cleaned:
-        parts = cleaned.split("-", 1)
+    cleaned = value.strip()
+    if " " in cleaned:
+        cleaned = cleaned.replace(" ", "")
+    sep = cleaned.find("..")
+    if sep >= 0:
+        end_sep = sep + 2
     else:
-        return None
-    if len(parts) != 2:
-        return None
-    start = _parse_number(parts[0])
-    end = _parse_number(parts[1])
+        sep = cleaned.find("-")
+        if sep < 0:
+            return None
+        end_sep = sep + 1
+    start = _parse_number(cleaned[:sep])
+    end = _parse_number(cleaned[end_sep:])
     if start is None or end is None:
         return None
     if start > end:
@@ -431,7 +486,7 @@ def _parse_range(value: str) -> tuple[float, float] | None:
 
 
 def _parse_bool(value: str) -> bool | None:
-    cleaned = value.strip().lower()
+    cleaned = _normalize_token(value)
     if cleaned in ("true", "t", "yes", "y", "1"):
         return True
     if cleaned in ("false", "f", "no", "n", "0"):
@@ -439,6 +494,7 @@ def _parse_bool(value: str) -> bool | None:
     return None
 
 
+@lru_cache(maxsize=None)
 def _format_error(field_key: str, op: str | None = None) -> str:
     meta = _FIELD_DEFS[field_key]
     ops = ", ".join(meta["ops"])
@@ -459,7 +515,7 @@ def _format_error(field_key: str, op: str | None = None) -> str:
         "First Flight=2005, Weight=575 (tons)."
     )
     parts = [f"Supported ops for {field_label}: {ops}."]
-    if op and op not in meta["ops"]:
+    if op and op not in meta["ops_set"]:
         parts.insert(0, f'Operator "{op}" is not valid for {field_label}.')
     if example_bits:
         parts.append(" ".join(example_bits) + ".")
@@ -467,11 +523,46 @@ def _format_error(field_key: str, op: str | None = None) -> str:
     return " ".join(parts)
 
 
+def _normalize_value(kind: str, value):
+    if kind in ("str", "manufacturer"):
+        return value.strip().lower() if type(value) is str else None
+    if kind == "list":
+        if type(value) is not list:
+            return None
+        return tuple(
+            item.strip().lower() for item in value if isinstance(item, str) and item.strip()
+        )
+    return value
+
+
+class _ModelTable:
+    def __init__(self, stamp: tuple | None, rows: list[dict]) -> None:
+        self.stamp = stamp
+        self.rows = [row for row in rows if isinstance(row, dict)]
+        self.codes: list[str | None] = []
+        for row in self.rows:
+            icao = row.get("id") or row.get("icao")
+            self.codes.append(
+                sys.intern(icao.strip().upper()) if isinstance(icao, str) and icao.strip() else None
+            )
+        self.has_card_category = any(row.get("cardCategory") for row in self.rows)
+        self._values: dict[str, list] = {}
+
+    def values(self, field_key: str) -> list:
+        values = self._values.get(field_key)
+        if values is None:
+            kind = _FIELD_DEFS[field_key]["kind"]
+            values = [_normalize_value(kind, row.get(field_key)) for row in self.rows]
+            self._values[field_key] = values
+        return values
+
+
+@lru_cache(maxsize=256)
 def _build_filter(
     field_key: str, op: str, raw_value: str
-) -> tuple[Callable[[dict], bool] | None, str | None]:
+) -> tuple[Callable[[object], bool] | None, str | None]:
     meta = _FIELD_DEFS[field_key]
-    if op not in meta["ops"]:
+    if op not in meta["ops_set"]:
         return None, _format_error(field_key, op)
     kind = meta["kind"]
     scale = float(meta.get("scale", 1.0))
@@ -485,11 +576,13 @@ def _build_filter(
             low *= scale
             high *= scale
 
-            def _predicate(row: dict) -> bool:
-                value = row.get(field_key)
-                if not isinstance(value, (int, float)) or isinstance(value, bool):
+            def _predicate(value) -> bool:
+                value_type = type(value)
+                if value_type is int:
+                    value = float(value)
+                elif value_type is not float:
                     return False
-                return low <= float(value) <= high
+                return low <= value <= high
 
             return _predicate, None
         if op == "in":
@@ -504,11 +597,13 @@ def _build_filter(
                 parsed_values.append(number * scale)
             values_set = {float(val) for val in parsed_values}
 
-            def _predicate(row: dict) -> bool:
-                value = row.get(field_key)
-                if not isinstance(value, (int, float)) or isinstance(value, bool):
+            def _predicate(value) -> bool:
+                value_type = type(value)
+                if value_type is int:
+                    value = float(value)
+                elif value_type is not float:
                     return False
-                return float(value) in values_set
+                return value in values_set
 
             return _predicate, None
 
@@ -517,24 +612,17 @@ def _build_filter(
             return None, f"Invalid number. {_format_error(field_key)}"
         target = number * scale
 
-        def _predicate(row: dict) -> bool:
-            value = row.get(field_key)
-            if not isinstance(value, (int, float)) or isinstance(value, bool):
+        compare = _NUMBER_OPS.get(op)
+        if compare is None:
+            return None, f"Unsupported filter type. {_format_error(field_key)}"
+
+        def _predicate(value) -> bool:
+            value_type = type(value)
+            if value_type is int:
+                value = float(value)
+            elif value_type is not float:
                 return False
-            value = float(value)
-            if op == "=":
-                return value == target
-            if op == "!=":
-                return value != target
-            if op == "<":
-                return value < target
-            if op == "<=":
-                return value <= target
-            if op == ">":
-                return value > target
-            if op == ">=":
-                return value >= target
-            return False
+            return compare(value, target)
 
         return _predicate, None
 
@@ -547,24 +635,17 @@ def _build_filter(
             if not values:
                 return None, f"Value must be a comma-separated list. {_format_error(field_key)}"
 
-            def _predicate(row: dict) -> bool:
-                value = row.get(field_key)
-                if not isinstance(value, str):
-                    return False
-                return value.strip().lower() in values
+            def _predicate(value: str | None) -> bool:
+                return value is not None and value in values
 
             return _predicate, None
 
-        def _predicate(row: dict) -> bool:
-            value = row.get(field_key)
-            if not isinstance(value, str):
-                return False
-            current = value.strip().lower()
-            if op == "=":
-                return current == text
-            if op == "!=":
-                return current != text
-            return False
+        compare = _STR_OPS.get(op)
+        if compare is None:
+            return None, f"Unsupported filter type. {_format_error(field_key)}"
+
+        def _predicate(value: str | None) -> bool:
+            return value is not None and compare(value, text)
 
         return _predicate, None
 
@@ -574,20 +655,17 @@ def _build_filter(
             if not needle:
                 return None, f"Value is required. {_format_error(field_key)}"
 
-            def _predicate(row: dict) -> bool:
-                value = row.get(field_key)
-                if not isinstance(value, list):
-                    return False
-                items = [
-                    item.strip().lower()
-                    for item in value
-                    if isinstance(item, str) and item.strip()
-                ]
-                if not items:
-                    return False
-                if op == "contains":
-                    return any(needle in item for item in items)
-                return any(item == needle or item.startswith(needle) for item in items)
+            if op == "contains":
+
+                def _predicate(items: tuple[str, ...] | None) -> bool:
+                    return bool(items) and any(needle in item for item in items)
+
+                return _predicate, None
+
+            def _predicate(items: tuple[str, ...] | None) -> bool:
+                return bool(items) and any(
+                    item == needle or item.startswith(needle) for item in items
+                )
 
             return _predicate, None
 
@@ -595,38 +673,20 @@ def _build_filter(
         if not values:
             return None, f"Value must be a comma-separated list. {_format_error(field_key)}"
 
-        def _matches_any(items: list[str], token: str) -> bool:
+        def _matches_any(items: tuple[str, ...], token: str) -> bool:
             return any(item == token or item.startswith(token) for item in items)
 
         if op == "has_any":
 
-            def _predicate(row: dict) -> bool:
-                value = row.get(field_key)
-                if not isinstance(value, list):
-                    return False
-                items = [
-                    item.strip().lower()
-                    for item in value
-                    if isinstance(item, str) and item.strip()
-                ]
-                return any(_matches_any(items, token) for token in values)
+            def _predicate(items: tuple[str, ...] | None) -> bool:
+                return bool(items) and any(_matches_any(items, token) for token in values)
 
             return _predicate, None
 
         if op == "has_all":
 
-            def _predicate(row: dict) -> bool:
-                value = row.get(field_key)
-                if not isinstance(value, list):
-                    return False
-                items = [
-                    item.strip().lower()
-                    for item in value
-                    if isinstance(item, str) and item.strip()
-                ]
-                if not items:
-                    return False
-                return all(_matches_any(items, token) for token in values)
+            def _predicate(items: tuple[str, ...] | None) -> bool:
+                return bool(items) and all(_matches_any(items, token) for token in values)
 
             return _predicate, None
 
@@ -635,50 +695,42 @@ def _build_filter(
         if not tokens:
             return None, f"Value must be a comma-separated list. {_format_error(field_key)}"
 
-        def _get_value(row: dict) -> str | None:
-            value = row.get(field_key)
-            if isinstance(value, str):
-                return value.strip().lower()
-            return None
-
         if op == "contains":
+            if len(tokens) == 1:
+                needle = tokens[0]
 
-            def _predicate(row: dict) -> bool:
-                value = _get_value(row)
-                if not value:
-                    return False
-                return any(token in value for token in tokens)
+                def _predicate(value: str | None) -> bool:
+                    return bool(value) and needle in value
+
+                return _predicate, None
+
+            pattern = re.compile("|".join(re.escape(token) for token in tokens))
+
+            def _predicate(value: str | None) -> bool:
+                return bool(value) and pattern.search(value) is not None
 
             return _predicate, None
 
         if op == "has":
             needle = tokens[0]
 
-            def _predicate(row: dict) -> bool:
-                value = _get_value(row)
-                if not value:
-                    return False
-                return value == needle
+            def _predicate(value: str | None) -> bool:
+                return bool(value) and value == needle
 
             return _predicate, None
 
         if op == "has_any":
+            token_set = frozenset(tokens)
 
-            def _predicate(row: dict) -> bool:
-                value = _get_value(row)
-                if not value:
-                    return False
-                return value in tokens
+            def _predicate(value: str | None) -> bool:
+                return bool(value) and value in token_set
 
             return _predicate, None
 
         if op == "has_all":
 
-            def _predicate(row: dict) -> bool:
-                value = _get_value(row)
-                if not value:
-                    return False
-                return all(token in value for token in tokens)
+            def _predicate(value: str | None) -> bool:
+                return bool(value) and all(token in value for token in tokens)
 
             return _predicate, None
 
@@ -687,8 +739,7 @@ def _build_filter(
         if parsed is None:
             return None, f"Value must be true/false. {_format_error(field_key)}"
 
-        def _predicate(row: dict) -> bool:
-            value = row.get(field_key)
+        def _predicate(value) -> bool:
             if isinstance(value, bool):
                 current = value
             else:
@@ -700,23 +751,37 @@ def _build_filter(
     return None, f"Unsupported filter type. {_format_error(field_key)}"
 
 
-def _chunk_codes(codes: list[str], chunk_size: int = 99) -> list[str]:
-    return [
-        ",".join(codes[idx : idx + chunk_size])
-        for idx in range(0, len(codes), chunk_size)
-    ]
+def _iter_chunks(codes: list[str], chunk_size: int = 99) -> Iterator[str]:
+    for idx in range(0, len(codes), chunk_size):
+        yield ",".join(codes[idx : idx + chunk_size])
+
+
+_ICAO_BYTES_CACHE: dict[str, bytes] = {}
+_USAGE_LOG = logging.getLogger(f"{__name__}.usage")
+
+
+def _chunk_payload(codes: list[str], chunk_size: int = 99) -> bytes:
+    encoded = []
+    for code in codes:
+        data = _ICAO_BYTES_CACHE.get(code)
+        if data is None:
+            data = _ICAO_BYTES_CACHE[code] = code.encode("utf-8")
+        encoded.append(data)
+    return b"\n".join(
+        b",".join(encoded[idx : idx + chunk_size])
+        for idx in range(0, len(encoded), chunk_size)
+    )
 
 
 def _format_preview(
     codes: list[str], max_len: int = 1800, chunk_size: int = 99
 ) -> tuple[str, bool]:
-    lines = _chunk_codes(codes, chunk_size)
-    if not lines:
+    if not codes:
         return "", False
     preview_lines: list[str] = []
     remaining = max_len
     truncated = False
-    for line in lines:
+    for line in _iter_chunks(codes, chunk_size):
         extra = len(line) + (1 if preview_lines else 0)
         if extra > remaining:
             truncated = True
@@ -872,21 +937,45 @@ def _all_ops() -> list[str]:
     return ops
 
 
-def register(tree, db, config) -> None:
+def _op_choices(ops) -> tuple[tuple[app_commands.Choice[str], str], ...]:
+    return tuple(
+        (app_commands.Choice(name=_OP_LABELS.get(op, op), value=op), _OP_LABELS.get(op, op).lower())
+        for op in ops
+    )
+
+
+_OP_AUTOCOMPLETE: dict[str | None, tuple[tuple[app_commands.Choice[str], str], ...]] = {
+    key: _op_choices(meta["ops"]) for key, meta in _FIELD_DEFS.items()
+}
+_OP_AUTOCOMPLETE[None] = _op_choices(_all_ops())
+
+
+def register(services) -> None:
+    tree = services.tree
+    db = services.db
+    model_table: _ModelTable | None = None
+
+    async def _load_model_table() -> _ModelTable:
+        nonlocal model_table
+        meta = await db.get_reference_meta("models")
+        stamp = (meta.get("updated_at"), meta.get("fetched_at"), meta.get("row_count")) if meta else None
+        if model_table is None or stamp is None or model_table.stamp != stamp:
+            model_table = _ModelTable(stamp, await db.fetch_reference_model_rows())
+        return model_table
+
     async def op_autocomplete(
         interaction: discord.Interaction, current: str
     ) -> list[app_commands.Choice[str]]:
         namespace = getattr(interaction, "namespace", None)
         field_value = getattr(namespace, "field", None) if namespace else None
         field_key = _resolve_field_key(field_value)
-        ops = _FIELD_DEFS[field_key]["ops"] if field_key in _FIELD_DEFS else _all_ops()
+        entries = _OP_AUTOCOMPLETE.get(field_key, _OP_AUTOCOMPLETE[None])
         current_lower = (current or "").lower()
-        choices = []
-        for op in ops:
-            label = _OP_LABELS.get(op, op)
-            if current_lower and current_lower not in label.lower() and current_lower not in op:
-                continue
-            choices.append(app_commands.Choice(name=label, value=op))
+        choices = [
+            choice
+            for choice, label_lower in entries
+            if not current_lower or current_lower in label_lower or current_lower in choice.value
+        ]
         return choices[:25]
 
     async def value_autocomplete(
@@ -895,19 +984,14 @@ def register(tree, db, config) -> None:
         namespace = getattr(interaction, "namespace", None)
         field_value = getattr(namespace, "field", None) if namespace else None
         field_key = _resolve_field_key(field_value)
-        if field_key == "cardCategory":
-            values = _FIELD_DEFS["cardCategory"]["values"]
-        elif field_key == "military":
-            values = ("true", "false")
-        elif field_key == "manufacturer":
-            values = _MANUFACTURER_AUTOCOMPLETE
-        else:
+        values = _VALUE_AUTOCOMPLETE.get(field_key)
+        if values is None:
             return []
         current_lower = (current or "").lower()
+        if field_key == "manufacturer" and current_lower:
+            return _manufacturer_matches(current_lower)
         choices = [
-            app_commands.Choice(name=value, value=value)
-            for value in values
-            if not current_lower or current_lower in value.lower()
+            choice for choice, lowered in values if not current_lower or current_lower in lowered
         ]
         return choices[:25]
 
@@ -953,30 +1037,28 @@ def register(tree, db, config) -> None:
             await interaction.response.send_message(error or _format_error(field_key), ephemeral=True)
             return
 
-        rows = await db.fetch_reference_model_rows()
+        table = await _load_model_table()
+        rows = table.rows
         if not rows:
             await interaction.response.send_message(
                 "No model data found. Ask an owner to run /refresh-reference.",
                 ephemeral=True,
             )
             return
-        if not any(isinstance(row, dict) and row.get("cardCategory") for row in rows):
+        if not table.has_card_category:
             await interaction.response.send_message(
                 "Model details are missing. Ask an owner to run /refresh-reference.",
                 ephemeral=True,
             )
             return
 
-        matches = []
-        for row in rows:
-            if not isinstance(row, dict):
-                continue
-            if predicate(row):
-                icao = row.get("id") or row.get("icao")
-                if isinstance(icao, str) and icao.strip():
-                    matches.append(icao.strip().upper())
+        match_set = {
+            code
+            for code, field_value in zip(table.codes, table.values(field_key))
+            if code and predicate(field_value)
+        }
 
-        if not matches:
+        if not match_set:
             _log_no_matches(field_key, resolved_op, value, rows)
             await interaction.response.send_message(
                 f"No aircraft matched that filter. {_format_error(field_key)}",
@@ -984,12 +1066,13 @@ def register(tree, db, config) -> None:
             )
             return
 
-        matches = sorted(set(matches))
+        _USAGE_LOG.info("filterlist field=%s op=%s matches=%d", field_key, resolved_op, len(match_set))
+        matches = sorted(match_set)
         preview, truncated = _format_preview(matches)
         needs_file = len(matches) > 99
         file = None
         if truncated or needs_file:
-            payload = "\n".join(_chunk_codes(matches)).encode("utf-8")
+            payload = _chunk_payload(matches)
             file = discord.File(io.BytesIO(payload), filename="filterlist.txt")
         if file is not None:
             await interaction.response.send_message(file=file, ephemeral=True)
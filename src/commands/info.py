@@ -5,8 +5,18 @@ import discord
 from discord import app_commands
 
 from ..reference_data import format_airport_label, format_model_label
+from ..utils import TTLCache
 from ..validation import normalize_code
 
+try:
+    import orjson
+except Exception:  # pragma: no cover - import guard
+    orjson = None  # type: ignore
+
+
+_AUTOCOMPLETE_CACHE = TTLCache(maxsize=2048, ttl=60.0)
+_PREVIEW_BYTES = 1800
+
 
 def _resolve_info_type(interaction: discord.Interaction) -> str | None:
     namespace = getattr(interaction, "namespace", None)
@@ -18,10 +28,20 @@ def _resolve_info_type(interaction: discord.Interaction) -> str | None:
     return None
 
 
-def _format_code_block(payload: dict) -> str:
-    text = json.dumps(payload, indent=2, sort_keys=True, default=str)
-    if len(text) > 1800:
-        text = text[:1800] + "\n..."
+def _json_dumps(payload: dict) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(
+            payload,
+            default=str,
+            option=orjson.OPT_INDENT_2 | orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS,
+        )
+    return json.dumps(payload, indent=2, sort_keys=True, default=str).encode("utf-8")
+
+
+def _format_code_block(blob: bytes) -> str:
+    text = blob[:_PREVIEW_BYTES].decode("utf-8", errors="ignore")
+    if len(blob) > _PREVIEW_BYTES:
+        text += "\n..."
     return f"```\n{text}\n```"
 
 
@@ -44,27 +64,39 @@ def _model_label_from_record(record: dict, fallback: str) -> str:
     return f"{icao} - {details}" if details else str(icao)
 
 
-def register(tree, db, config, reference_data) -> None:
+def register(services) -> None:
+    tree = services.tree
+    db = services.db
+    reference_data = services.reference_data
+
     async def code_autocomplete(
         interaction: discord.Interaction, current: str
     ) -> list[app_commands.Choice[str]]:
         info_type = _resolve_info_type(interaction)
+        if info_type not in ("aircraft", "airport"):
+            return []
+        query = str(current or "").strip().lower()
+        key = (info_type, reference_data.generation, query)
+        cached = _AUTOCOMPLETE_CACHE.get(key)
+        if cached is not None:
+            return cached
         if info_type == "aircraft":
-            models = await reference_data.search_models(current)
-            return [
+            models = await reference_data.search_models(query)
+            choices = [
                 app_commands.Choice(name=format_model_label(model), value=model.icao)
                 for model in models
             ]
-        if info_type == "airport":
-            airports = await reference_data.search_airports(current)
-            return [
+        else:
+            airports = await reference_data.search_airports(query)
+            choices = [
                 app_commands.Choice(
                     name=format_airport_label(airport),
                     value=airport.iata or airport.icao,
                 )
                 for airport in airports
             ]
-        return []
+        _AUTOCOMPLETE_CACHE.set(key, choices)
+        return choices
 
     @tree.command(name="info", description="Show details for an airport or aircraft.")
     @app_commands.describe(info_type="Info type", code="ICAO/IATA code")
@@ -116,12 +148,16 @@ def register(tree, db, config, reference_data) -> None:
             )
 
         payload = record if isinstance(record, dict) else {}
-        preview = _format_code_block(payload)
-        file_bytes = json.dumps(payload, indent=2, sort_keys=True, default=str).encode("utf-8")
-        file = discord.File(io.BytesIO(file_bytes), filename=f"{info_type.value}-{normalized}.json")
+        file_bytes = _json_dumps(payload)
+        preview = _format_code_block(file_bytes)
+        files = []
+        if len(file_bytes) > _PREVIEW_BYTES:
+            files.append(
+                discord.File(io.BytesIO(file_bytes), filename=f"{info_type.value}-{normalized}.json")
+            )
         await interaction.response.send_message(
             embed=embed,
             content=preview,
-            file=file,
+            files=files,
             ephemeral=True,
         )
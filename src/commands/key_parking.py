@@ -7,10 +7,6 @@ from discord import app_commands
 _PARK_DURATION = timedelta(hours=24)
 
 
-def _format_timestamp(value: datetime) -> str:
-    return value.astimezone(timezone.utc).strftime("%Y-%m-%d %H:%M UTC")
-
-
 def _mask_suffix(value: str) -> str:
     cleaned = str(value).strip()
     if not cleaned:
@@ -18,40 +14,57 @@ def _mask_suffix(value: str) -> str:
     return cleaned[-4:]
 
 
-def _suffix_for_index(config, index: int) -> str | None:
-    if index < 1 or index > len(config.fr24_api_keys):
-        return None
-    return _mask_suffix(config.fr24_api_keys[index - 1])
+def _key_choices(
+    suffixes: dict[int, str],
+) -> tuple[tuple[app_commands.Choice[int], str], ...]:
+    choices = []
+    for idx, suffix in suffixes.items():
+        name = f"{idx}: ***{suffix}"
+        choices.append((app_commands.Choice(name=name, value=idx), name.lower()))
+    return tuple(choices)
 
 
-def _build_key_choices(config, current: str) -> list[app_commands.Choice[int]]:
+def _build_key_choices(
+    key_choices: tuple[tuple[app_commands.Choice[int], str], ...], current: str
+) -> list[app_commands.Choice[int]]:
     query = str(current or "").strip().lower()
-    choices: list[app_commands.Choice[int]] = []
-    for idx, key in enumerate(config.fr24_api_keys, start=1):
-        suffix = _mask_suffix(key)
-        name = f"{idx}: ***{suffix}"
-        if not query or query in name.lower() or query == str(idx):
-            choices.append(app_commands.Choice(name=name, value=idx))
+    if not query:
+        return [choice for choice, _ in key_choices[:25]]
+    choices = [
+        choice
+        for choice, lowered in key_choices
+        if query in lowered or query == str(choice.value)
+    ]
     return choices[:25]
 
 
-def register(tree, db, config, fr24) -> None:
+def register(services) -> None:
+    tree = services.tree
+    db = services.db
+    config = services.config
+    fr24 = services.fr24
+
+    suffixes = {
+        idx: _mask_suffix(key) for idx, key in enumerate(config.fr24_api_keys, start=1)
+    }
+    key_choices = _key_choices(suffixes)
+
     async def _autocomplete_key_index(
         interaction: discord.Interaction, current: str
     ) -> list[app_commands.Choice[int]]:
-        return _build_key_choices(config, current)
+        return _build_key_choices(key_choices, current)
 
     @tree.command(name="park-key", description="Park an FR24 API key for 24 hours.")
     @app_commands.describe(key_index="FR24 API key index to park")
     @app_commands.autocomplete(key_index=_autocomplete_key_index)
     async def park_key(interaction: discord.Interaction, key_index: int) -> None:
-        if interaction.user.id not in config.bot_owner_ids:
+        if interaction.user.id not in config.bot_owner_id_set:
             await interaction.response.send_message(
                 "Only a bot owner can park keys.",
                 ephemeral=True,
             )
             return
-        suffix = _suffix_for_index(config, key_index)
+        suffix = suffixes.get(key_index)
         if not suffix:
             await interaction.response.send_message(
                 "Invalid key index.",
@@ -73,7 +86,7 @@ def register(tree, db, config, fr24) -> None:
             "manual",
         )
         await interaction.response.send_message(
-            f"Key {key_index} (***{suffix}) parked until {_format_timestamp(parked_until)}.",
+            f"Key {key_index} (***{suffix}) parked until <t:{int(parked_until.timestamp())}:f>.",
             ephemeral=True,
         )
 
@@ -81,13 +94,13 @@ def register(tree, db, config, fr24) -> None:
     @app_commands.describe(key_index="FR24 API key index to unpark")
     @app_commands.autocomplete(key_index=_autocomplete_key_index)
     async def unpark_key(interaction: discord.Interaction, key_index: int) -> None:
-        if interaction.user.id not in config.bot_owner_ids:
+        if interaction.user.id not in config.bot_owner_id_set:
             await interaction.response.send_message(
                 "Only a bot owner can unpark keys.",
                 ephemeral=True,
             )
             return
-        suffix = _suffix_for_index(config, key_index)
+        suffix = suffixes.get(key_index)
         if not suffix:
             await interaction.response.send_message(
                 "Invalid key index.",
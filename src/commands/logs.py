@@ -1,10 +1,15 @@
+import io
+
 import discord
 from discord import app_commands
 
-from ..logs import format_log_block, read_log_tail
+from ..logs import read_log_tail
+
 
+def register(services) -> None:
+    tree = services.tree
+    config = services.config
 
-def register(tree, db, config) -> None:
     @tree.command(name="logs", description="Show recent bot logs (owner-only).")
     @app_commands.describe(
         lines="Number of lines to show (1-200)",
@@ -15,7 +20,7 @@ def register(tree, db, config) -> None:
         lines: int = 50,
         contains: str | None = None,
     ) -> None:
-        if interaction.user.id not in config.bot_owner_ids:
+        if interaction.user.id not in config.bot_owner_id_set:
             await interaction.response.send_message(
                 "Only bot owners can use this command.",
                 ephemeral=True,
@@ -35,6 +40,10 @@ def register(tree, db, config) -> None:
             )
             return
 
-        text = format_log_block(entries, limit=1800)
+        text = "\n".join(entries)
+        if len(text) > 1800:
+            file = discord.File(io.BytesIO(text.encode("utf-8")), filename="logs.txt")
+            await interaction.response.send_message(file=file, ephemeral=True)
+            return
         content = f"```\n{text}\n```"
         await interaction.response.send_message(content, ephemeral=True)
@@ -15,6 +15,7 @@ class SubscriptionsView(discord.ui.View):
         self.subs = subs
         self.page_size = 10
         self.page = 0
+        self._page_cache: dict[int, tuple[str, list[discord.SelectOption]]] = {}
         self._rebuild()
 
     async def interaction_check(self, interaction: discord.Interaction) -> bool:
@@ -35,14 +36,30 @@ class SubscriptionsView(discord.ui.View):
         end = start + self.page_size
         return self.subs[start:end]
 
-    def _build_embed(self) -> discord.Embed:
-        total = len(self.subs)
-        title = f"Your subscriptions ({total})"
+    def _page_content(self) -> tuple[str, list[discord.SelectOption]]:
+        cached = self._page_cache.get(self.page)
+        if cached is not None:
+            return cached
         lines = ["Select a subscription below to remove it."]
+        options = []
         offset = self.page * self.page_size
         for idx, item in enumerate(self._page_items(), start=offset + 1):
             lines.append(f"{idx}. {item['type']}: {item['label']}")
-        description = "\n".join(lines) if lines else "No subscriptions yet."
+            options.append(
+                discord.SelectOption(
+                    label=item["label"],
+                    value=item["value"],
+                    description=item["type"],
+                )
+            )
+        cached = ("\n".join(lines), options)
+        self._page_cache[self.page] = cached
+        return cached
+
+    def _build_embed(self) -> discord.Embed:
+        total = len(self.subs)
+        title = f"Your subscriptions ({total})"
+        description, _ = self._page_content()
         embed = discord.Embed(title=title, description=description, color=discord.Color.blurple())
         pages = self._page_count()
         if pages > 1:
@@ -86,23 +103,12 @@ class SubscriptionsView(discord.ui.View):
         self.add_item(prev_button)
         self.add_item(next_button)
 
-        options = []
-        for item in self._page_items():
-            label = item["label"]
-            value = f"{item['type']}|{item['code']}"
-            options.append(
-                discord.SelectOption(
-                    label=label,
-                    value=value,
-                    description=item["type"],
-                )
-            )
-
+        _, options = self._page_content()
         select = discord.ui.Select(
             placeholder="Remove a subscription",
             min_values=1,
             max_values=1,
-            options=options,
+            options=list(options),
         )
 
         async def select_callback(interaction: discord.Interaction) -> None:
@@ -115,11 +121,8 @@ class SubscriptionsView(discord.ui.View):
                 code=code,
             )
             if removed:
-                self.subs = [
-                    item
-                    for item in self.subs
-                    if not (item["type"] == sub_type and item["code"] == code)
-                ]
+                self.subs = [item for item in self.subs if item["value"] != selection]
+                self._page_cache.clear()
                 if self.page >= self._page_count():
                     self.page = max(0, self._page_count() - 1)
             if not self.subs:
@@ -146,7 +149,11 @@ def _build_label(item: dict, ref) -> str:
     return item["code"]
 
 
-def register(tree, db, config, reference_data) -> None:
+def register(services) -> None:
+    tree = services.tree
+    db = services.db
+    reference_data = services.reference_data
+
     @tree.command(name="my-subs", description="List your current subscriptions.")
     async def my_subs(interaction: discord.Interaction) -> None:
         if interaction.guild_id is None:
@@ -156,46 +163,39 @@ def register(tree, db, config, reference_data) -> None:
             )
             return
 
+        guild_id = str(interaction.guild_id)
+        await interaction.response.defer(ephemeral=True)
         rows = await db.fetch_user_subscriptions(
-            guild_id=str(interaction.guild_id),
+            guild_id=guild_id,
             user_id=str(interaction.user.id),
         )
         if not rows:
-            await interaction.response.send_message(
+            await interaction.followup.send(
                 "You do not have any subscriptions yet.",
                 ephemeral=True,
             )
             return
 
-        subs = []
-        for row in rows:
-            code = row["code"]
-            sub_type = row["type"]
-            if sub_type == "aircraft":
-                ref = await reference_data.get_model(code)
-            elif sub_type == "airport":
-                if len(code) == 3:
-                    ref = await reference_data.get_airport_by_iata(code)
-                else:
-                    ref = await reference_data.get_airport(code)
-            else:
-                ref = None
-            label = _build_label(row, ref)
-            subs.append(
-                {
-                    "type": sub_type,
-                    "code": code,
-                    "label": label,
-                }
-            )
+        refs = await reference_data.get_subscription_refs(
+            (row["type"], row["code"]) for row in rows
+        )
+        subs = [
+            {
+                "type": row["type"],
+                "code": row["code"],
+                "label": _build_label(row, ref),
+                "value": f"{row['type']}|{row['code']}",
+            }
+            for row, ref in zip(rows, refs)
+        ]
 
         view = SubscriptionsView(
             db=db,
-            guild_id=str(interaction.guild_id),
+            guild_id=guild_id,
             user_id=interaction.user.id,
             subs=subs,
         )
-        await interaction.response.send_message(
+        await interaction.followup.send(
             embed=view._build_embed(),
             view=view,
             ephemeral=True,
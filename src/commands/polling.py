@@ -4,10 +4,15 @@ from discord import app_commands
 from ..utils import utc_now_iso
 
 
-def register(tree, db, config, poller_state) -> None:
+def register(services) -> None:
+    tree = services.tree
+    db = services.db
+    config = services.config
+    poller_state = services.poller_state
+
     @tree.command(name="start", description="Start the FR24 polling loop.")
     async def start(interaction: discord.Interaction) -> None:
-        if interaction.user.id not in config.bot_owner_ids:
+        if interaction.user.id not in config.bot_owner_id_set:
             await interaction.response.send_message(
                 "Only a bot owner can start polling.", ephemeral=True
             )
@@ -21,7 +26,7 @@ def register(tree, db, config, poller_state) -> None:
 
     @tree.command(name="stop", description="Stop the FR24 polling loop.")
     async def stop(interaction: discord.Interaction) -> None:
-        if interaction.user.id not in config.bot_owner_ids:
+        if interaction.user.id not in config.bot_owner_id_set:
             await interaction.response.send_message(
                 "Only a bot owner can stop polling.", ephemeral=True
             )
@@ -41,7 +46,7 @@ def register(tree, db, config, poller_state) -> None:
     async def set_polling_interval(
         interaction: discord.Interaction, seconds: int
     ) -> None:
-        if interaction.user.id not in config.bot_owner_ids:
+        if interaction.user.id not in config.bot_owner_id_set:
             await interaction.response.send_message(
                 "Only a bot owner can change the polling interval.", ephemeral=True
             )
@@ -4,14 +4,24 @@ import discord
 from discord import app_commands
 
 
-def register(tree, db, config, reference_data) -> None:
+_MIN_REFRESH_AGE_SECONDS = 60
+
+
+def register(services) -> None:
+    tree = services.tree
+    config = services.config
+    reference_data = services.reference_data
+
     log = logging.getLogger(__name__)
 
     @tree.command(
         name="refresh-reference",
         description="Refresh airport/model reference data used for autocomplete.",
     )
-    @app_commands.describe(dataset="Which reference dataset to refresh")
+    @app_commands.describe(
+        dataset="Which reference dataset to refresh",
+        force="Refresh even if the dataset was fetched within the last minute",
+    )
     @app_commands.choices(
         dataset=[
             app_commands.Choice(name="airports", value="airports"),
@@ -22,8 +32,9 @@ def register(tree, db, config, reference_data) -> None:
     async def refresh_reference(
         interaction: discord.Interaction,
         dataset: app_commands.Choice[str],
+        force: bool = False,
     ) -> None:
-        if interaction.user.id not in config.bot_owner_ids:
+        if interaction.user.id not in config.bot_owner_id_set:
             await interaction.response.send_message(
                 "Only a bot owner can refresh reference data.",
                 ephemeral=True,
@@ -32,7 +43,10 @@ def register(tree, db, config, reference_data) -> None:
 
         await interaction.response.defer(ephemeral=True)
         try:
-            results = await reference_data.refresh(dataset.value)
+            results = await reference_data.refresh(
+                dataset.value,
+                min_age_seconds=0 if force else _MIN_REFRESH_AGE_SECONDS,
+            )
         except Exception as exc:
             log.exception("Reference refresh failed")
             await interaction.followup.send(
@@ -46,8 +60,9 @@ def register(tree, db, config, reference_data) -> None:
             if key not in results:
                 continue
             entry = results[key]
-            lines.append(
-                f"{key}: {entry.get('rows')} rows (updated_at={entry.get('updated_at')}, fetched_at={entry.get('fetched_at')})"
-            )
+            line = f"{key}: {entry.get('rows')} rows (updated_at={entry.get('updated_at')}, fetched_at={entry.get('fetched_at')})"
+            if entry.get("skipped"):
+                line += " - already fresh, skipped (use force to refetch)"
+            lines.append(line)
         message = "Reference refresh complete.\n" + "\n".join(lines)
         await interaction.followup.send(message, ephemeral=True)
@@ -4,14 +4,16 @@ import discord
 from discord import app_commands
 
 
-def register(tree, db, config) -> None:
-    log = logging.getLogger(__name__)
+def _clean_name(value: str | None) -> str | None:
+    return (value or "").strip() or None
+
 
-    def _clean_name(value: str | None) -> str | None:
-        if not value:
-            return None
-        cleaned = value.strip()
-        return cleaned or None
+def register(services) -> None:
+    tree = services.tree
+    db = services.db
+    config = services.config
+
+    log = logging.getLogger(__name__)
 
     @tree.command(
         name="set-change-roles",
@@ -31,7 +33,7 @@ def register(tree, db, config) -> None:
                 "This command can only be used in a server.", ephemeral=True
             )
             return
-        if interaction.user.id not in config.bot_owner_ids:
+        if interaction.user.id not in config.bot_owner_id_set:
             await interaction.response.send_message(
                 "Only a bot owner can set change roles.", ephemeral=True
             )
@@ -42,14 +44,6 @@ def register(tree, db, config) -> None:
             )
             return
 
-        settings = await db.get_guild_settings(str(interaction.guild_id))
-        if not settings:
-            await interaction.response.send_message(
-                "No notification channel set. Run /set-notify-channel first.",
-                ephemeral=True,
-            )
-            return
-
         user_name = _clean_name(
             getattr(interaction.user, "display_name", None) or interaction.user.name
         )
@@ -59,15 +53,7 @@ def register(tree, db, config) -> None:
         airport_role_id = str(airport_role.id) if airport_role else None
         airport_role_name = _clean_name(airport_role.name) if airport_role else None
 
-        log.debug(
-            "set-change-roles guild_id=%s aircraft_role_id=%s airport_role_id=%s user_id=%s",
-            interaction.guild_id,
-            aircraft_role_id,
-            airport_role_id,
-            interaction.user.id,
-        )
-
-        await db.set_guild_change_roles(
+        settings = await db.set_guild_change_roles(
             guild_id=str(interaction.guild_id),
             aircraft_role_id=aircraft_role_id,
             aircraft_role_name=aircraft_role_name,
@@ -76,11 +62,23 @@ def register(tree, db, config) -> None:
             updated_by=str(interaction.user.id),
             updated_by_name=user_name,
         )
+        if not settings:
+            await interaction.response.send_message(
+                "No notification channel set. Run /set-notify-channel first.",
+                ephemeral=True,
+            )
+            return
 
-        final_aircraft = (
-            aircraft_role_id or settings.get("aircraft_change_role_id")
+        log.debug(
+            "set-change-roles guild_id=%s aircraft_role_id=%s airport_role_id=%s user_id=%s",
+            interaction.guild_id,
+            aircraft_role_id,
+            airport_role_id,
+            interaction.user.id,
         )
-        final_airport = airport_role_id or settings.get("airport_change_role_id")
+
+        final_aircraft = settings.get("aircraft_change_role_id")
+        final_airport = settings.get("airport_change_role_id")
         aircraft_text = f"<@&{final_aircraft}>" if final_aircraft else "none"
         airport_text = f"<@&{final_airport}>" if final_airport else "none"
 
@@ -1,10 +1,44 @@
 import logging
+import re
 from dataclasses import dataclass
 
 import discord
 from discord import app_commands
 
 
+log = logging.getLogger(__name__)
+
+_CHANNEL_MENTION_RE = re.compile(r"<#(\d+)>")
+
+
+def _parse_channel_id(raw: object) -> int | None:
+    if not raw:
+        return None
+    if isinstance(raw, int):
+        return raw
+    text = str(raw)
+    try:
+        return int(text)
+    except ValueError:
+        pass
+    if text.startswith("<#"):
+        match = _CHANNEL_MENTION_RE.fullmatch(text)
+        if match:
+            return int(match.group(1))
+    return None
+
+
+def _coerce_permissions(raw: object) -> discord.Permissions | None:
+    if raw is None:
+        return None
+    if isinstance(raw, discord.Permissions):
+        return raw
+    try:
+        return discord.Permissions(int(raw))
+    except (TypeError, ValueError):
+        return None
+
+
 @dataclass(frozen=True)
 class ChannelRef:
     id: int
@@ -23,38 +57,29 @@ class ChannelRefTransformer(app_commands.Transformer):
     async def transform(
         self, interaction: discord.Interaction, value: object
     ) -> ChannelRef:
-        log = logging.getLogger(__name__)
         data = getattr(interaction, "data", {}) if interaction else {}
-        options = data.get("options") if isinstance(data, dict) else None
-        resolved_channels = None
-        if isinstance(data, dict):
-            resolved = data.get("resolved", {})
-            resolved_channels = (
-                resolved.get("channels") if isinstance(resolved, dict) else None
-            )
-        log.debug(
-            "set-notify-channel transform start value=%r type=%s guild_id=%s options=%s resolved_channel_ids=%s",
-            value,
-            type(value).__name__,
-            getattr(interaction, "guild_id", None),
-            options,
-            (
-                list(resolved_channels.keys())
-                if isinstance(resolved_channels, dict)
-                else None
-            ),
+        if not isinstance(data, dict):
+            data = {}
+        resolved = data.get("resolved")
+        resolved_channels = (
+            resolved.get("channels") if isinstance(resolved, dict) else None
         )
+        if not isinstance(resolved_channels, dict):
+            resolved_channels = {}
+        if log.isEnabledFor(logging.DEBUG):
+            log.debug(
+                "set-notify-channel transform start value=%r type=%s guild_id=%s options=%s resolved_channel_ids=%s",
+                value,
+                type(value).__name__,
+                getattr(interaction, "guild_id", None),
+                data.get("options"),
+                list(resolved_channels),
+            )
         if hasattr(value, "id") and hasattr(value, "type"):
             channel_id = int(getattr(value, "id"))
             name = getattr(value, "name", str(channel_id))
             channel_type = getattr(value, "type")
-            permissions_raw = getattr(value, "permissions", None)
-            permissions = None
-            if permissions_raw is not None:
-                try:
-                    permissions = discord.Permissions(int(permissions_raw))
-                except (TypeError, ValueError):
-                    permissions = None
+            permissions = _coerce_permissions(getattr(value, "permissions", None))
             log.debug(
                 "set-notify-channel transform: value is channel-like id=%s", channel_id
             )
@@ -68,46 +93,41 @@ class ChannelRefTransformer(app_commands.Transformer):
         channel_id = None
         if isinstance(value, int):
             channel_id = value
-        elif isinstance(value, str) and value.isdigit():
-            channel_id = int(value)
+        elif isinstance(value, str):
+            channel_id = _parse_channel_id(value)
         elif isinstance(value, dict):
-            raw_id = value.get("id") or value.get("value")
-            if raw_id and str(raw_id).isdigit():
-                channel_id = int(raw_id)
+            channel_id = _parse_channel_id(value.get("id") or value.get("value"))
 
-        if channel_id is None and isinstance(data, dict):
+        if channel_id is None:
+            namespace_value = getattr(
+                getattr(interaction, "namespace", None), "channel", None
+            )
+            if namespace_value is not None:
+                channel_id = _parse_channel_id(
+                    getattr(namespace_value, "id", namespace_value)
+                )
+        if channel_id is None:
             for opt in data.get("options", []):
                 if opt.get("name") == "channel":
-                    raw_value = opt.get("value")
-                    if raw_value and str(raw_value).isdigit():
-                        channel_id = int(raw_value)
+                    channel_id = _parse_channel_id(opt.get("value"))
                     break
         log.debug("set-notify-channel transform: channel_id=%s", channel_id)
 
-        if channel_id is not None:
-            resolved = data.get("resolved") if isinstance(data, dict) else None
-            if isinstance(resolved, dict):
-                channels = resolved.get("channels", {})
-                channel_data = channels.get(str(channel_id))
-                if channel_data and channel_data.get("type") == 0:
-                    log.debug(
-                        "set-notify-channel transform: resolved channel data name=%s type=%s",
-                        channel_data.get("name"),
-                        channel_data.get("type"),
-                    )
-                    permissions = None
-                    permissions_raw = channel_data.get("permissions")
-                    if permissions_raw is not None:
-                        try:
-                            permissions = discord.Permissions(int(permissions_raw))
-                        except (TypeError, ValueError):
-                            permissions = None
-                    return ChannelRef(
-                        id=channel_id,
-                        name=channel_data.get("name", str(channel_id)),
-                        channel_type=discord.ChannelType.text,
-                        permissions=permissions,
-                    )
+        channel_data = (
+            resolved_channels.get(str(channel_id)) if channel_id is not None else None
+        )
+        if channel_data and channel_data.get("type") == 0:
+            log.debug(
+                "set-notify-channel transform: resolved channel data name=%s type=%s",
+                channel_data.get("name"),
+                channel_data.get("type"),
+            )
+            return ChannelRef(
+                id=channel_id,
+                name=channel_data.get("name", str(channel_id)),
+                channel_type=discord.ChannelType.text,
+                permissions=_coerce_permissions(channel_data.get("permissions")),
+            )
 
         log.error(
             "set-notify-channel transform failed value=%r type=%s channel_id=%s",
@@ -118,14 +138,28 @@ class ChannelRefTransformer(app_commands.Transformer):
         raise app_commands.TransformerError(value, self.type, self)
 
 
-def register(tree, db, config) -> None:
-    log = logging.getLogger(__name__)
+def _clean_name(value: str | None) -> str | None:
+    return (value or "").strip() or None
 
-    def _clean_name(value: str | None) -> str | None:
-        if not value:
+
+def register(services) -> None:
+    tree = services.tree
+    db = services.db
+    config = services.config
+
+    def _bot_permissions(
+        interaction: discord.Interaction, channel: ChannelRef
+    ) -> discord.Permissions | None:
+        if channel.permissions is not None:
+            return channel.permissions
+        guild = interaction.guild
+        if guild is None:
+            return None
+        guild_channel = guild.get_channel(channel.id)
+        me = guild.me
+        if guild_channel is None or me is None:
             return None
-        cleaned = value.strip()
-        return cleaned or None
+        return guild_channel.permissions_for(me)
 
     async def _resolve_guild_name(interaction: discord.Interaction) -> str | None:
         guild = interaction.guild or interaction.client.get_guild(interaction.guild_id)
@@ -157,7 +191,7 @@ def register(tree, db, config) -> None:
                 "This command can only be used in a server.", ephemeral=True
             )
             return
-        if interaction.user.id not in config.bot_owner_ids:
+        if interaction.user.id not in config.bot_owner_id_set:
             await interaction.response.send_message(
                 "Only a bot owner can set the notify channel.", ephemeral=True
             )
@@ -170,13 +204,15 @@ def register(tree, db, config) -> None:
             )
             return
 
-        if channel.permissions and not channel.permissions.send_messages:
+        permissions = _bot_permissions(interaction, channel)
+        if permissions is not None and not permissions.send_messages:
             await interaction.response.send_message(
                 f"I don't have permission to send messages in {channel.mention}.",
                 ephemeral=True,
             )
             return
 
+        await interaction.response.defer(ephemeral=True, thinking=True)
         guild_name = await _resolve_guild_name(interaction)
         user_name = _clean_name(
             getattr(interaction.user, "display_name", None) or interaction.user.name
@@ -198,7 +234,7 @@ def register(tree, db, config) -> None:
             channel_name=_clean_name(channel.name),
             updated_by_name=user_name,
         )
-        await interaction.response.send_message(
+        await interaction.followup.send(
             f"Notifications will be posted in {channel.mention}.",
             ephemeral=True,
         )
@@ -214,10 +250,14 @@ def register(tree, db, config) -> None:
             error_type = getattr(error, "type", None)
         data = getattr(interaction, "data", None)
         raw_options = None
+        resolved_channel_count = 0
         if isinstance(data, dict):
             raw_options = data.get("options")
+            resolved = data.get("resolved")
+            channels = resolved.get("channels") if isinstance(resolved, dict) else None
+            resolved_channel_count = len(channels) if isinstance(channels, dict) else 0
         log.error(
-            "set-notify-channel error: %s value=%r value_type=%s option_type=%s guild_id=%s user_id=%s channel_id=%s options=%s data=%s",
+            "set-notify-channel error: %s value=%r value_type=%s option_type=%s guild_id=%s user_id=%s channel_id=%s options=%s resolved_channel_count=%d",
             error,
             error_value,
             type(error_value).__name__ if error_value is not None else None,
@@ -226,10 +266,11 @@ def register(tree, db, config) -> None:
             getattr(interaction.user, "id", None),
             getattr(interaction, "channel_id", None),
             raw_options,
-            data,
+            resolved_channel_count,
+            extra={"raw_data": data},
         )
-        if not interaction.response.is_done():
-            await interaction.response.send_message(
-                "I couldn't parse that channel. Try selecting from the channel picker and rerun the command.",
-                ephemeral=True,
-            )
+        message = "I couldn't parse that channel. Try selecting from the channel picker and rerun the command."
+        if interaction.response.is_done():
+            await interaction.followup.send(message, ephemeral=True)
+        else:
+            await interaction.response.send_message(message, ephemeral=True)
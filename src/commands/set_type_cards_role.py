@@ -4,14 +4,16 @@ import discord
 from discord import app_commands
 
 
-def register(tree, db, config) -> None:
-    log = logging.getLogger(__name__)
+def _clean_name(value: str | None) -> str | None:
+    return (value or "").strip() or None
+
 
-    def _clean_name(value: str | None) -> str | None:
-        if not value:
-            return None
-        cleaned = value.strip()
-        return cleaned or None
+def register(services) -> None:
+    tree = services.tree
+    db = services.db
+    config = services.config
+
+    log = logging.getLogger(__name__)
 
     @tree.command(
         name="set-type-cards-role",
@@ -27,7 +29,7 @@ def register(tree, db, config) -> None:
                 "This command can only be used in a server.", ephemeral=True
             )
             return
-        if interaction.user.id not in config.bot_owner_ids:
+        if interaction.user.id not in config.bot_owner_id_set:
             await interaction.response.send_message(
                 "Only a bot owner can set the type cards role.", ephemeral=True
             )
@@ -38,9 +40,11 @@ def register(tree, db, config) -> None:
             )
             return
 
-        settings = await db.get_guild_settings(str(interaction.guild_id))
+        await interaction.response.defer(ephemeral=True, thinking=True)
+        guild_id = str(interaction.guild_id)
+        settings = await db.get_guild_settings(guild_id)
         if not settings:
-            await interaction.response.send_message(
+            await interaction.followup.send(
                 "No notification channel set. Run /set-notify-channel first.",
                 ephemeral=True,
             )
@@ -61,14 +65,14 @@ def register(tree, db, config) -> None:
         )
 
         await db.set_guild_typecards_role(
-            guild_id=str(interaction.guild_id),
+            guild_id=guild_id,
             role_id=role_id,
             role_name=role_name,
             updated_by=str(interaction.user.id),
             updated_by_name=user_name,
         )
 
-        await interaction.response.send_message(
+        await interaction.followup.send(
             f"Type cards role updated: <@&{role_id}>.",
             ephemeral=True,
         )
@@ -1,3 +1,4 @@
+import asyncio
 import logging
 
 import discord
@@ -17,43 +18,50 @@ def _resolve_subscription_type(interaction: discord.Interaction) -> str | None:
     return None
 
 
-def register(tree, db, config, reference_data) -> None:
+def _clean_name(value: str | None) -> str | None:
+    return (value or "").strip() or None
+
+
+def register(services) -> None:
+    tree = services.tree
+    db = services.db
+    reference_data = services.reference_data
+
     log = logging.getLogger(__name__)
 
-    def _clean_name(value: str | None) -> str | None:
-        if not value:
-            return None
-        cleaned = value.strip()
-        return cleaned or None
+    background_tasks: set[asyncio.Task] = set()
 
-    async def _resolve_guild_name(interaction: discord.Interaction) -> str | None:
+    def _cached_guild_name(interaction: discord.Interaction) -> str | None:
         guild = interaction.guild or interaction.client.get_guild(interaction.guild_id)
-        name = _clean_name(getattr(guild, "name", None)) if guild else None
-        if name:
-            return name
+        return _clean_name(getattr(guild, "name", None)) if guild else None
+
+    async def _backfill_guild_name(client: discord.Client, guild_id: int) -> None:
         try:
-            fetched = await interaction.client.fetch_guild(interaction.guild_id)
+            fetched = await client.fetch_guild(guild_id)
         except (discord.Forbidden, discord.NotFound, discord.HTTPException) as exc:
             log.warning(
                 "subscribe fetch_guild failed guild_id=%s error=%s",
-                interaction.guild_id,
+                guild_id,
                 exc,
             )
-            return None
-        return _clean_name(getattr(fetched, "name", None))
+            return
+        guild_name = _clean_name(getattr(fetched, "name", None))
+        if guild_name:
+            await db.update_subscription_guild_name(str(guild_id), guild_name)
 
     async def code_autocomplete(
         interaction: discord.Interaction, current: str
     ) -> list[app_commands.Choice[str]]:
         sub_type = _resolve_subscription_type(interaction)
+        query = str(current or "").strip().lower()
         if sub_type == "aircraft":
-            models = await reference_data.search_models(current)
+            models = await reference_data.search_models(query)
             return [
                 app_commands.Choice(name=format_model_label(model), value=model.icao)
                 for model in models
             ]
         if sub_type == "airport":
-            airports = await reference_data.search_airports(current)
+            airports = await reference_data.search_airports(query)
             return [
                 app_commands.Choice(
                     name=format_airport_label(airport),
@@ -85,9 +93,11 @@ def register(tree, db, config, reference_data) -> None:
             await interaction.response.send_message("This command can only be used in a server.", ephemeral=True)
             return
 
-        settings = await db.get_guild_settings(str(interaction.guild_id))
+        await interaction.response.defer(ephemeral=True, thinking=True)
+        guild_id = str(interaction.guild_id)
+        settings = await db.get_guild_settings(guild_id)
         if not settings:
-            await interaction.response.send_message(
+            await interaction.followup.send(
                 "No notification channel set. Ask the bot owner to run /set-notify-channel.",
                 ephemeral=True,
             )
@@ -95,7 +105,7 @@ def register(tree, db, config, reference_data) -> None:
 
         normalized = normalize_code(subscription_type.value, code)
         if not normalized:
-            await interaction.response.send_message(
+            await interaction.followup.send(
                 "Invalid code format. Codes must be at least 2 characters.",
                 ephemeral=True,
             )
@@ -114,7 +124,7 @@ def register(tree, db, config, reference_data) -> None:
                 display_code = ref.iata or ref.icao or normalized
                 normalized = display_code
 
-        guild_name = await _resolve_guild_name(interaction)
+        guild_name = _cached_guild_name(interaction)
         user_name = _clean_name(
             getattr(interaction.user, "display_name", None) or interaction.user.name
         )
@@ -127,24 +137,30 @@ def register(tree, db, config, reference_data) -> None:
             subscription_type.value,
             normalized,
         )
-        inserted = await db.add_subscription(
-            guild_id=str(interaction.guild_id),
+        add_subscription = db.add_subscription(
+            guild_id=guild_id,
             user_id=str(interaction.user.id),
             sub_type=subscription_type.value,
             code=normalized,
             guild_name=guild_name,
             user_name=user_name,
         )
+        if subscription_type.value == "aircraft":
+            inserted, found = await asyncio.gather(
+                add_subscription, reference_data.get_model(normalized)
+            )
+        else:
+            inserted = await add_subscription
+            found = None
 
         warning = None
         if subscription_type.value == "aircraft":
-            found = await reference_data.get_model(normalized)
-            if not found and await reference_data.has_models():
+            if not found and reference_data.models_loaded:
                 warning = (
                     "Warning: that aircraft ICAO is not in the Skycards reference data."
                 )
         elif subscription_type.value == "airport":
-            if not ref_found and await reference_data.has_airports():
+            if not ref_found and reference_data.airports_loaded:
                 warning = (
                     "Warning: that airport code is not in the Skycards reference data."
                 )
@@ -153,9 +169,16 @@ def register(tree, db, config, reference_data) -> None:
             message = f"Subscribed to {subscription_type.value} {display_code}."
             if warning:
                 message = f"{message}\n{warning}"
-            await interaction.response.send_message(message, ephemeral=True)
+            await interaction.followup.send(message, ephemeral=True)
         else:
-            await interaction.response.send_message(
+            await interaction.followup.send(
                 f"You are already subscribed to {subscription_type.value} {display_code}.",
                 ephemeral=True,
             )
+
+        if guild_name is None:
+            task = asyncio.create_task(
+                _backfill_guild_name(interaction.client, interaction.guild_id)
+            )
+            background_tasks.add(task)
+            task.add_done_callback(background_tasks.discard)
@@ -15,7 +15,11 @@ def _resolve_subscription_type(interaction: discord.Interaction) -> str | None:
     return None
 
 
-def register(tree, db, config, reference_data) -> None:
+def register(services) -> None:
+    tree = services.tree
+    db = services.db
+    reference_data = services.reference_data
+
     async def code_autocomplete(
         interaction: discord.Interaction, current: str
     ) -> list[app_commands.Choice[str]]:
@@ -36,23 +40,16 @@ def register(tree, db, config, reference_data) -> None:
             value = value.replace(" ", "")
         if value:
             codes = [code for code in codes if value in code]
+        codes = codes[:25]
+        refs = await reference_data.get_subscription_refs((sub_type, code) for code in codes)
         choices = []
-        for code in codes:
+        for code, ref in zip(codes, refs):
             label = code
-            if sub_type == "aircraft":
-                model = await reference_data.get_model(code)
-                if model:
-                    label = format_model_label(model)
-            elif sub_type == "airport":
-                if len(code) == 3:
-                    airport = await reference_data.get_airport_by_iata(code)
-                else:
-                    airport = await reference_data.get_airport(code)
-                if airport:
-                    label = format_airport_label(airport)
+            if ref and sub_type == "aircraft":
+                label = format_model_label(ref)
+            elif ref and sub_type == "airport":
+                label = format_airport_label(ref)
             choices.append(app_commands.Choice(name=label, value=code))
-            if len(choices) >= 25:
-                break
         return choices
 
     @tree.command(
@@ -85,6 +82,7 @@ def register(tree, db, config, reference_data) -> None:
             )
             return
 
+        await interaction.response.defer(ephemeral=True, thinking=True)
         codes_to_try = [normalized]
         display_code = normalized
         if subscription_type.value == "airport":
@@ -101,11 +99,13 @@ def register(tree, db, config, reference_data) -> None:
                 if alternate and alternate not in codes_to_try:
                     codes_to_try.append(alternate)
 
+        guild_id = str(interaction.guild_id)
+        user_id = str(interaction.user.id)
         removed = False
         for candidate in codes_to_try:
             removed = await db.remove_subscription(
-                guild_id=str(interaction.guild_id),
-                user_id=str(interaction.user.id),
+                guild_id=guild_id,
+                user_id=user_id,
                 sub_type=subscription_type.value,
                 code=candidate,
             )
@@ -113,12 +113,12 @@ def register(tree, db, config, reference_data) -> None:
                 break
 
         if removed:
-            await interaction.response.send_message(
+            await interaction.followup.send(
                 f"Unsubscribed from {subscription_type.value} {display_code}.",
                 ephemeral=True,
             )
         else:
-            await interaction.response.send_message(
+            await interaction.followup.send(
                 f"No subscription found for {subscription_type.value} {display_code}.",
                 ephemeral=True,
             )
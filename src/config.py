@@ -1,4 +1,5 @@
 from dataclasses import dataclass
+from functools import cached_property
 import os
 
 
@@ -105,6 +106,10 @@ class Config:
     log_retention_hours: int
     log_level: str
 
+    @cached_property
+    def bot_owner_id_set(self) -> frozenset[int]:
+        return frozenset(self.bot_owner_ids)
+
 
 def load_config() -> Config:
     return Config(
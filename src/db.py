@@ -2,10 +2,34 @@ from __future__ import annotations
 
 import json
 import sqlite3
+from dataclasses import dataclass
 
 import aiosqlite
 
-from .utils import utc_now_iso
+from .utils import TTLCache, utc_now_iso
+
+
+_DELETE_BATCH_SIZE = 5000
+
+_GUILD_SETTINGS_COLUMNS = """
+    guild_id, guild_name, notify_channel_id, notify_channel_name,
+    aircraft_change_role_id, aircraft_change_role_name,
+    airport_change_role_id, airport_change_role_name,
+    typecards_role_id, typecards_role_name,
+    updated_by, updated_by_name, updated_at
+"""
+_GUILD_SETTINGS_TTL_SECONDS = 60.0
+_MISSING = object()
+
+
+@dataclass(frozen=True, slots=True)
+class KeyCreditsTable:
+    suffixes: list[str]
+    remaining: list[int | None]
+    consumed: list[int | None]
+    updated_at: list[str | None]
+    parked_until: list[str | None]
+    parked_reason: list[str | None]
 
 
 _SCHEMA_SQL = '''
@@ -43,6 +67,9 @@ CREATE TABLE IF NOT EXISTS subscriptions (
 CREATE INDEX IF NOT EXISTS idx_subscriptions_guild_type_code
     ON subscriptions (guild_id, type, code);
 
+CREATE INDEX IF NOT EXISTS idx_subscriptions_type_code
+    ON subscriptions (type, code);
+
 CREATE TABLE IF NOT EXISTS notification_log (
     id INTEGER PRIMARY KEY AUTOINCREMENT,
     subscription_id INTEGER NOT NULL,
@@ -67,6 +94,9 @@ CREATE INDEX IF NOT EXISTS idx_typecard_notification_log_notified_at
 CREATE INDEX IF NOT EXISTS idx_notification_log_notified_at
     ON notification_log (notified_at);
 
+CREATE INDEX IF NOT EXISTS idx_notification_log_subscription_notified_at
+    ON notification_log (subscription_id, notified_at DESC);
+
 CREATE TABLE IF NOT EXISTS usage_cache (
     id INTEGER PRIMARY KEY CHECK (id = 1),
     payload TEXT NOT NULL,
@@ -132,6 +162,7 @@ class Database:
     def __init__(self, path: str) -> None:
         self._path = path
         self._conn: aiosqlite.Connection | None = None
+        self._guild_settings = TTLCache(maxsize=1024, ttl=_GUILD_SETTINGS_TTL_SECONDS)
 
     async def connect(self) -> None:
         self._conn = await aiosqlite.connect(self._path)
@@ -142,6 +173,11 @@ class Database:
 
     async def close(self) -> None:
         if self._conn:
+            try:
+                await self._conn.execute("PRAGMA analysis_limit = 1000")
+                await self._conn.execute("PRAGMA optimize")
+            except sqlite3.Error:
+                pass
             await self._conn.close()
 
     async def init(self) -> None:
@@ -281,6 +317,25 @@ class Database:
                 f"ALTER TABLE {table} ADD COLUMN {column} {col_type}"
             )
 
+    async def _delete_older_than(self, table: str, older_than_iso: str) -> int:
+        if not self._conn:
+            raise RuntimeError("Database not connected")
+        deleted = 0
+        while True:
+            cur = await self._conn.execute(
+                f'''
+                DELETE FROM {table}
+                WHERE rowid IN (
+                    SELECT rowid FROM {table} WHERE notified_at < ? LIMIT ?
+                )
+                ''',
+                (older_than_iso, _DELETE_BATCH_SIZE),
+            )
+            await self._conn.commit()
+            deleted += cur.rowcount
+            if cur.rowcount < _DELETE_BATCH_SIZE:
+                return deleted
+
     async def _changes(self) -> int:
         if not self._conn:
             raise RuntimeError("Database not connected")
@@ -288,23 +343,31 @@ class Database:
             row = await cur.fetchone()
         return int(row[0]) if row else 0
 
+    def _update_cached_guild_settings(
+        self, guild_id: str, values: dict, coalesce: frozenset[str] = frozenset()
+    ) -> None:
+        settings = self._guild_settings.get(guild_id)
+        if settings is None:
+            self._guild_settings.pop(guild_id)
+            return
+        for key, value in values.items():
+            if value is not None or key not in coalesce:
+                settings[key] = value
+
     async def get_guild_settings(self, guild_id: str) -> dict | None:
         if not self._conn:
             raise RuntimeError("Database not connected")
+        settings = self._guild_settings.get(guild_id, _MISSING)
+        if settings is not _MISSING:
+            return dict(settings) if settings is not None else None
         async with self._conn.execute(
-            '''
-            SELECT guild_id, guild_name, notify_channel_id, notify_channel_name,
-                   aircraft_change_role_id, aircraft_change_role_name,
-                   airport_change_role_id, airport_change_role_name,
-                   typecards_role_id, typecards_role_name,
-                   updated_by, updated_by_name, updated_at
-            FROM guild_settings
-            WHERE guild_id = ?
-            ''',
+            f"SELECT {_GUILD_SETTINGS_COLUMNS} FROM guild_settings WHERE guild_id = ?",
             (guild_id,),
         ) as cur:
             row = await cur.fetchone()
-        return dict(row) if row else None
+        settings = dict(row) if row else None
+        self._guild_settings.set(guild_id, settings)
+        return dict(settings) if settings is not None else None
 
     async def fetch_guild_channels(self) -> dict[str, str]:
         if not self._conn:
@@ -351,6 +414,7 @@ class Database:
     ) -> None:
         if not self._conn:
             raise RuntimeError("Database not connected")
+        updated_at = utc_now_iso()
         await self._conn.execute(
             '''
             INSERT INTO guild_settings (
@@ -378,10 +442,22 @@ class Database:
                 channel_name,
                 updated_by,
                 updated_by_name,
-                utc_now_iso(),
+                updated_at,
             ),
         )
         await self._conn.commit()
+        self._update_cached_guild_settings(
+            guild_id,
+            {
+                "guild_name": guild_name,
+                "notify_channel_id": channel_id,
+                "notify_channel_name": channel_name,
+                "updated_by": updated_by,
+                "updated_by_name": updated_by_name,
+                "updated_at": updated_at,
+            },
+            coalesce=frozenset(("guild_name", "notify_channel_name", "updated_by_name")),
+        )
 
     async def set_guild_change_roles(
         self,
@@ -392,11 +468,11 @@ class Database:
         airport_role_name: str | None,
         updated_by: str,
         updated_by_name: str | None = None,
-    ) -> None:
+    ) -> dict | None:
         if not self._conn:
             raise RuntimeError("Database not connected")
-        await self._conn.execute(
-            '''
+        async with self._conn.execute(
+            f'''
             UPDATE guild_settings
             SET aircraft_change_role_id = COALESCE(?, aircraft_change_role_id),
                 aircraft_change_role_name = COALESCE(?, aircraft_change_role_name),
@@ -406,6 +482,7 @@ class Database:
                 updated_by_name = COALESCE(?, updated_by_name),
                 updated_at = ?
             WHERE guild_id = ?
+            RETURNING {_GUILD_SETTINGS_COLUMNS}
             ''',
             (
                 aircraft_role_id,
@@ -417,8 +494,12 @@ class Database:
                 utc_now_iso(),
                 guild_id,
             ),
-        )
+        ) as cur:
+            row = await cur.fetchone()
         await self._conn.commit()
+        settings = dict(row) if row else None
+        self._guild_settings.set(guild_id, settings)
+        return dict(settings) if settings is not None else None
 
     async def set_guild_typecards_role(
         self,
@@ -430,6 +511,7 @@ class Database:
     ) -> None:
         if not self._conn:
             raise RuntimeError("Database not connected")
+        updated_at = utc_now_iso()
         await self._conn.execute(
             '''
             UPDATE guild_settings
@@ -445,11 +527,22 @@ class Database:
                 role_name,
                 updated_by,
                 updated_by_name,
-                utc_now_iso(),
+                updated_at,
                 guild_id,
             ),
         )
         await self._conn.commit()
+        self._update_cached_guild_settings(
+            guild_id,
+            {
+                "typecards_role_id": role_id,
+                "typecards_role_name": role_name,
+                "updated_by": updated_by,
+                "updated_by_name": updated_by_name,
+                "updated_at": updated_at,
+            },
+            coalesce=frozenset(("updated_by_name",)),
+        )
 
     async def add_subscription(
         self,
@@ -486,6 +579,20 @@ class Database:
             await self._conn.commit()
         return inserted
 
+    async def update_subscription_guild_name(self, guild_id: str, guild_name: str) -> int:
+        if not self._conn:
+            raise RuntimeError("Database not connected")
+        await self._conn.execute(
+            '''
+            UPDATE subscriptions
+            SET guild_name = ?
+            WHERE guild_id = ? AND guild_name IS NOT ?
+            ''',
+            (guild_name, guild_id, guild_name),
+        )
+        await self._conn.commit()
+        return await self._changes()
+
     async def remove_subscription(self, guild_id: str, user_id: str, sub_type: str, code: str) -> bool:
         if not self._conn:
             raise RuntimeError("Database not connected")
@@ -573,12 +680,7 @@ class Database:
     async def cleanup_notifications(self, older_than_iso: str) -> int:
         if not self._conn:
             raise RuntimeError("Database not connected")
-        await self._conn.execute(
-            "DELETE FROM notification_log WHERE notified_at < ?",
-            (older_than_iso,),
-        )
-        await self._conn.commit()
-        return await self._changes()
+        return await self._delete_older_than("notification_log", older_than_iso)
 
     async def typecard_notification_logged(
         self, guild_id: str, icao: str, flight_id: str
@@ -617,12 +719,7 @@ class Database:
     async def cleanup_typecard_notifications(self, older_than_iso: str) -> int:
         if not self._conn:
             raise RuntimeError("Database not connected")
-        await self._conn.execute(
-            "DELETE FROM typecard_notification_log WHERE notified_at < ?",
-            (older_than_iso,),
-        )
-        await self._conn.commit()
-        return await self._changes()
+        return await self._delete_older_than("typecard_notification_log", older_than_iso)
 
     async def get_usage_cache(self) -> dict | None:
         if not self._conn:
@@ -718,6 +815,33 @@ class Database:
             rows = await cur.fetchall()
         return [dict(row) for row in rows]
 
+    async def get_fr24_key_credits_table(self) -> KeyCreditsTable:
+        if not self._conn:
+            raise RuntimeError("Database not connected")
+        async with self._conn.execute(
+            '''
+            SELECT key_suffix, remaining, consumed, updated_at, parked_until, parked_reason
+            FROM fr24_key_credits
+            WHERE key_suffix IS NOT NULL AND key_suffix != ''
+            '''
+        ) as cur:
+            rows = await cur.fetchall()
+        if not rows:
+            return KeyCreditsTable([], [], [], [], [], [])
+        return KeyCreditsTable(*(list(column) for column in zip(*rows)))
+
+    async def get_fr24_key_credits_fingerprint(self) -> tuple:
+        if not self._conn:
+            raise RuntimeError("Database not connected")
+        async with self._conn.execute(
+            '''
+            SELECT COUNT(*), MAX(updated_at), MAX(parked_at), COUNT(parked_until)
+            FROM fr24_key_credits
+            '''
+        ) as cur:
+            row = await cur.fetchone()
+        return tuple(row) if row else ()
+
     async def set_fr24_key_credits(
         self,
         key_suffix: str,
@@ -1040,7 +1164,7 @@ class Database:
             INSERT INTO reference_airports (icao, iata, name, city, place_code, lat, lon, alt, raw_json)
             VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
             ''',
-            [
+            (
                 (
                     row.get("icao"),
                     row.get("iata"),
@@ -1053,7 +1177,7 @@ class Database:
                     row.get("raw_json"),
                 )
                 for row in rows
-            ],
+            ),
         )
         await self._conn.execute(
             '''
@@ -1080,7 +1204,7 @@ class Database:
             INSERT INTO reference_models (icao, manufacturer, name, raw_json)
             VALUES (?, ?, ?, ?)
             ''',
-            [
+            (
                 (
                     row.get("icao"),
                     row.get("manufacturer"),
@@ -1088,7 +1212,7 @@ class Database:
                     row.get("raw_json"),
                 )
                 for row in rows
-            ],
+            ),
         )
         await self._conn.execute(
             '''
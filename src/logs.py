@@ -1,9 +1,11 @@
 from __future__ import annotations
 
-from collections import deque
 import glob
 import os
-from typing import Iterable
+from typing import Iterator
+
+
+_TAIL_CHUNK_SIZE = 8192
 
 
 def _iter_log_paths(log_dir: str, base_name: str = "bot.log") -> list[str]:
@@ -13,6 +15,28 @@ def _iter_log_paths(log_dir: str, base_name: str = "bot.log") -> list[str]:
     return paths
 
 
+def _iter_reversed_lines(handle) -> Iterator[bytes]:
+    handle.seek(0, os.SEEK_END)
+    position = handle.tell()
+    if position == 0:
+        return
+    remainder = b""
+    trailing = True
+    while position > 0:
+        step = min(_TAIL_CHUNK_SIZE, position)
+        position -= step
+        handle.seek(position)
+        parts = (handle.read(step) + remainder).split(b"\n")
+        if trailing:
+            if len(parts) > 1 and not parts[-1]:
+                parts.pop()
+            trailing = False
+        remainder = parts[0]
+        for part in reversed(parts[1:]):
+            yield part
+    yield remainder
+
+
 def read_log_tail(
     log_dir: str,
     lines: int = 200,
@@ -24,22 +48,22 @@ def read_log_tail(
     if not os.path.isdir(log_dir):
         return []
     needle = contains.lower().strip() if contains else None
-    buffer: deque[str] = deque(maxlen=lines)
-    for path in _iter_log_paths(log_dir, base_name):
+    needle_bytes = needle.encode("ascii") if needle and needle.isascii() else None
+    collected: list[str] = []
+    for path in reversed(_iter_log_paths(log_dir, base_name)):
         try:
-            with open(path, "r", encoding="utf-8", errors="replace") as handle:
-                for raw_line in handle:
-                    line = raw_line.rstrip("\n")
-                    if needle and needle not in line.lower():
+            with open(path, "rb") as handle:
+                for raw_line in _iter_reversed_lines(handle):
+                    if needle_bytes is not None and needle_bytes not in raw_line.lower():
                         continue
-                    buffer.append(line)
+                    line = raw_line.rstrip(b"\r").decode("utf-8", errors="replace")
+                    if needle and needle_bytes is None and needle not in line.lower():
+                        continue
+                    collected.append(line)
+                    if len(collected) >= lines:
+                        collected.reverse()
+                        return collected
         except OSError:
             continue
-    return list(buffer)
-
-
-def format_log_block(lines: Iterable[str], limit: int = 1900) -> str:
-    text = "\n".join(lines)
-    if len(text) > limit:
-        text = text[-limit:]
-    return text
+    collected.reverse()
+    return collected
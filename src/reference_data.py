@@ -1,18 +1,37 @@
 from __future__ import annotations
 
 import asyncio
+import io
 import json
 import logging
+from bisect import bisect_right
 from dataclasses import dataclass
-from typing import Iterable
+from datetime import datetime, timezone
+from typing import Iterable, Iterator
 from urllib.request import Request, urlopen
 
 from .utils import utc_now_iso
 
+try:
+    import orjson
+except Exception:  # pragma: no cover - import guard
+    orjson = None  # type: ignore
+
+try:
+    import ijson
+except Exception:  # pragma: no cover - import guard
+    ijson = None  # type: ignore
+
 
 _DEFAULT_TIMEOUT_SECONDS = 30
 
 
+def _json_loads(value):
+    if orjson is not None:
+        return orjson.loads(value)
+    return json.loads(value)
+
+
 @dataclass(frozen=True)
 class AirportRef:
     icao: str
@@ -38,6 +57,11 @@ def _normalize_text(value: str | None) -> str:
     return (value or "").strip()
 
 
+def _normalize_query(value: str | None) -> str:
+    cleaned = _normalize_text(value)
+    return cleaned if cleaned.islower() or not cleaned else cleaned.lower()
+
+
 def _normalize_code(value: str | None) -> str:
     return (value or "").strip().upper()
 
@@ -101,6 +125,58 @@ def _build_model_ref(row: dict) -> ModelRef | None:
     )
 
 
+_PREFIX_INDEX_LIMIT = 25
+
+
+@dataclass(frozen=True)
+class _SearchIndex:
+    prefixes: dict[str, tuple[int, ...]]
+    blob: str
+    starts: list[int]
+
+
+def _build_search_index(refs: list) -> _SearchIndex:
+    prefixes: dict[str, list[int]] = {}
+    for idx, ref in enumerate(refs):
+        for token in set(ref.search_key.split()):
+            for end in range(1, len(token) + 1):
+                bucket = prefixes.setdefault(token[:end], [])
+                if len(bucket) < _PREFIX_INDEX_LIMIT and (not bucket or bucket[-1] != idx):
+                    bucket.append(idx)
+    starts = []
+    offset = 0
+    for ref in refs:
+        starts.append(offset)
+        offset += len(ref.search_key) + 1
+    return _SearchIndex(
+        prefixes={key: tuple(bucket) for key, bucket in prefixes.items()},
+        blob="\0".join(ref.search_key for ref in refs),
+        starts=starts,
+    )
+
+
+def _search_refs(refs: list, index: _SearchIndex, query: str, limit: int) -> list:
+    value = _normalize_query(query)
+    if not value:
+        return []
+    positions = list(index.prefixes.get(value, ())[:limit])
+    if len(positions) < limit:
+        seen = set(positions)
+        starts = index.starts
+        blob = index.blob
+        pos = blob.find(value)
+        while pos >= 0:
+            idx = bisect_right(starts, pos) - 1
+            if idx not in seen:
+                positions.append(idx)
+                if len(positions) >= limit:
+                    break
+            if idx + 1 >= len(starts):
+                break
+            pos = blob.find(value, starts[idx + 1])
+    return [refs[idx] for idx in positions]
+
+
 def _payload_rows_from_rows(rows: Iterable[dict], dataset: str) -> list[dict]:
     payload_rows: list[dict] = []
     for row in rows:
@@ -108,7 +184,7 @@ def _payload_rows_from_rows(rows: Iterable[dict], dataset: str) -> list[dict]:
         payload: dict | None = None
         if raw_json:
             try:
-                payload = json.loads(raw_json)
+                payload = _json_loads(raw_json)
             except json.JSONDecodeError:
                 payload = None
         if not isinstance(payload, dict):
@@ -166,23 +242,68 @@ def format_model_label(ref: ModelRef) -> str:
     return label[:100]
 
 
-def fetch_reference_payload_sync(
-    base_url: str,
-    endpoint: str,
-    client_version: str,
-    timeout_seconds: int = _DEFAULT_TIMEOUT_SECONDS,
-) -> dict:
+def _reference_request(base_url: str, endpoint: str, client_version: str) -> Request:
     url = f"{base_url.rstrip('/')}/{endpoint.lstrip('/')}"
-    request = Request(
+    return Request(
         url,
         headers={
             "x-client-version": client_version,
             "Accept": "application/json",
         },
     )
+
+
+def fetch_reference_bytes_sync(
+    base_url: str,
+    endpoint: str,
+    client_version: str,
+    timeout_seconds: int = _DEFAULT_TIMEOUT_SECONDS,
+) -> bytes:
+    request = _reference_request(base_url, endpoint, client_version)
     with urlopen(request, timeout=timeout_seconds) as response:
-        payload = response.read()
-    return json.loads(payload)
+        return response.read()
+
+
+def fetch_reference_payload_sync(
+    base_url: str,
+    endpoint: str,
+    client_version: str,
+    timeout_seconds: int = _DEFAULT_TIMEOUT_SECONDS,
+) -> dict:
+    return _json_loads(
+        fetch_reference_bytes_sync(base_url, endpoint, client_version, timeout_seconds)
+    )
+
+
+def _iter_stream_rows(stream, meta: dict) -> Iterator[dict]:
+    builder = None
+    for prefix, event, value in ijson.parse(stream, use_float=True):
+        if builder is not None:
+            builder.event(event, value)
+            if prefix == "rows.item" and event == "end_map":
+                yield builder.value
+                builder = None
+        elif prefix == "rows.item" and event == "start_map":
+            builder = ijson.ObjectBuilder()
+            builder.event(event, value)
+        elif prefix == "updatedAt" and event not in ("start_map", "start_array"):
+            meta["updatedAt"] = value
+
+
+def iter_airports_payload(data: bytes, meta: dict) -> Iterator[dict]:
+    # meta["updated_at"] is only known once the generator has been exhausted.
+    if ijson is None:
+        updated_at, rows = parse_airports_payload(_json_loads(data))
+        yield from rows
+        meta["updated_at"] = updated_at
+        return
+    raw_meta: dict = {}
+    for row in _iter_stream_rows(io.BytesIO(data), raw_meta):
+        record = _airport_record(row)
+        if record:
+            yield record
+    updated_at = raw_meta.get("updatedAt")
+    meta["updated_at"] = str(updated_at) if updated_at is not None else None
 
 
 async def fetch_reference_payload(
@@ -200,26 +321,37 @@ async def fetch_reference_payload(
     )
 
 
+async def _fetch_reference_payload_timed(
+    base_url: str, endpoint: str, client_version: str
+) -> tuple[dict, str]:
+    payload = await fetch_reference_payload(base_url, endpoint, client_version)
+    return payload, utc_now_iso()
+
+
+def _airport_record(row: dict) -> dict | None:
+    ref = _build_airport_ref(row)
+    if not ref:
+        return None
+    return {
+        "icao": ref.icao,
+        "iata": ref.iata,
+        "name": ref.name,
+        "city": ref.city,
+        "place_code": ref.place_code,
+        "lat": ref.lat,
+        "lon": ref.lon,
+        "alt": ref.alt,
+        "raw_json": json.dumps(row, sort_keys=True, default=str),
+    }
+
+
 def parse_airports_payload(payload: dict) -> tuple[str | None, list[dict]]:
     updated_at = payload.get("updatedAt")
     rows = []
     for row in payload.get("rows", []):
-        ref = _build_airport_ref(row)
-        if not ref:
-            continue
-        rows.append(
-            {
-                "icao": ref.icao,
-                "iata": ref.iata,
-                "name": ref.name,
-                "city": ref.city,
-                "place_code": ref.place_code,
-                "lat": ref.lat,
-                "lon": ref.lon,
-                "alt": ref.alt,
-                "raw_json": json.dumps(row, sort_keys=True, default=str),
-            }
-        )
+        record = _airport_record(row)
+        if record:
+            rows.append(record)
     return str(updated_at) if updated_at is not None else None, rows
 
 
@@ -253,6 +385,9 @@ class ReferenceDataCache:
         self._airports_by_icao: dict[str, AirportRef] = {}
         self._airports_by_iata: dict[str, AirportRef] = {}
         self._models_by_icao: dict[str, ModelRef] = {}
+        self._airport_index = _build_search_index([])
+        self._model_index = _build_search_index([])
+        self.generation = 0
 
     def set_airports(self, rows: Iterable[dict]) -> None:
         refs = []
@@ -267,6 +402,8 @@ class ReferenceDataCache:
         self._airports = refs
         self._airports_by_icao = {ref.icao: ref for ref in refs}
         self._airports_by_iata = iata_map
+        self._airport_index = _build_search_index(refs)
+        self.generation += 1
 
     def set_models(self, rows: Iterable[dict]) -> None:
         refs = []
@@ -277,6 +414,8 @@ class ReferenceDataCache:
         refs.sort(key=lambda item: item.icao)
         self._models = refs
         self._models_by_icao = {ref.icao: ref for ref in refs}
+        self._model_index = _build_search_index(refs)
+        self.generation += 1
 
     def has_airports(self) -> bool:
         return bool(self._airports)
@@ -294,28 +433,10 @@ class ReferenceDataCache:
         return self._models_by_icao.get(_normalize_code(icao))
 
     def search_airports(self, query: str, limit: int = 25) -> list[AirportRef]:
-        value = _normalize_text(query).lower()
-        if not value:
-            return []
-        matches = []
-        for ref in self._airports:
-            if value in ref.search_key:
-                matches.append(ref)
-                if len(matches) >= limit:
-                    break
-        return matches
+        return _search_refs(self._airports, self._airport_index, query, limit)
 
     def search_models(self, query: str, limit: int = 25) -> list[ModelRef]:
-        value = _normalize_text(query).lower()
-        if not value:
-            return []
-        matches = []
-        for ref in self._models:
-            if value in ref.search_key:
-                matches.append(ref)
-                if len(matches) >= limit:
-                    break
-        return matches
+        return _search_refs(self._models, self._model_index, query, limit)
 
 
 class ReferenceDataService:
@@ -327,6 +448,18 @@ class ReferenceDataService:
         self._lock = asyncio.Lock()
         self._refresh_lock = asyncio.Lock()
 
+    @property
+    def generation(self) -> int:
+        return self._cache.generation
+
+    @property
+    def airports_loaded(self) -> bool:
+        return self._cache.has_airports()
+
+    @property
+    def models_loaded(self) -> bool:
+        return self._cache.has_models()
+
     async def load_from_db(self) -> dict[str, int]:
         airports = await self._db.fetch_reference_airports()
         models = await self._db.fetch_reference_models()
@@ -335,20 +468,64 @@ class ReferenceDataService:
             self._cache.set_models(models)
         return {"airports": len(airports), "models": len(models)}
 
-    async def refresh(self, dataset: str) -> dict[str, dict]:
+    async def _recent_meta(self, dataset: str, min_age_seconds: float) -> dict | None:
+        if min_age_seconds <= 0:
+            return None
+        meta = await self._db.get_reference_meta(dataset)
+        if not meta or not meta.get("fetched_at"):
+            return None
+        try:
+            fetched_at = datetime.fromisoformat(meta["fetched_at"])
+        except ValueError:
+            return None
+        if fetched_at.tzinfo is None:
+            fetched_at = fetched_at.replace(tzinfo=timezone.utc)
+        age = (datetime.now(timezone.utc) - fetched_at).total_seconds()
+        if age >= min_age_seconds:
+            return None
+        return meta
+
+    async def refresh(self, dataset: str, min_age_seconds: float = 0) -> dict[str, dict]:
         log = logging.getLogger(__name__)
         if dataset not in ("airports", "models", "all"):
             raise ValueError("dataset must be airports, models, or all")
         results: dict[str, dict] = {}
         async with self._refresh_lock:
             datasets = (dataset,) if dataset != "all" else ("airports", "models")
+            pending = []
             for target in datasets:
-                endpoint = "airports" if target == "airports" else "models"
-                log.info("Refreshing reference data: %s", target)
-                payload = await fetch_reference_payload(
-                    self._base_url, endpoint, self._client_version
+                meta = await self._recent_meta(target, min_age_seconds)
+                if meta is None:
+                    pending.append(target)
+                    continue
+                log.info(
+                    "Skipping reference refresh for %s; fetched at %s",
+                    target,
+                    meta["fetched_at"],
                 )
-                fetched_at = utc_now_iso()
+                results[target] = {
+                    "rows": meta.get("row_count"),
+                    "updated_at": meta.get("updated_at"),
+                    "fetched_at": meta.get("fetched_at"),
+                    "skipped": True,
+                }
+            for target in pending:
+                log.info("Refreshing reference data: %s", target)
+            fetched = await asyncio.gather(
+                *(
+                    _fetch_reference_payload_timed(
+                        self._base_url, target, self._client_version
+                    )
+                    for target in pending
+                ),
+                return_exceptions=True,
+            )
+            error: BaseException | None = None
+            for target, outcome in zip(pending, fetched):
+                if isinstance(outcome, BaseException):
+                    error = error or outcome
+                    continue
+                payload, fetched_at = outcome
                 if target == "airports":
                     updated_at, rows = parse_airports_payload(payload)
                     await self._db.replace_reference_airports(rows, updated_at, fetched_at)
@@ -364,6 +541,8 @@ class ReferenceDataService:
                     "updated_at": updated_at,
                     "fetched_at": fetched_at,
                 }
+            if error is not None:
+                raise error
         return results
 
     async def refresh_with_payloads(self, dataset: str) -> dict[str, dict]:
@@ -424,6 +603,23 @@ class ReferenceDataService:
         async with self._lock:
             return self._cache.get_model(icao)
 
+    async def get_subscription_refs(
+        self, items: Iterable[tuple[str, str]]
+    ) -> list[AirportRef | ModelRef | None]:
+        refs: list[AirportRef | ModelRef | None] = []
+        async with self._lock:
+            for sub_type, code in items:
+                if sub_type == "aircraft":
+                    refs.append(self._cache.get_model(code))
+                elif sub_type == "airport":
+                    if len(code) == 3:
+                        refs.append(self._cache.get_airport_by_iata(code))
+                    else:
+                        refs.append(self._cache.get_airport(code))
+                else:
+                    refs.append(None)
+        return refs
+
     async def filter_missing_models(self, icaos: list[str]) -> list[str]:
         async with self._lock:
             return [icao for icao in icaos if self._cache.get_model(icao) is None]
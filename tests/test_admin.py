@@ -0,0 +1,85 @@
+import argparse
+import re
+import sqlite3
+
+from src import admin
+
+
+_CORE_SCHEMA = """
+CREATE TABLE guild_settings (
+    guild_id TEXT PRIMARY KEY,
+    notify_channel_id TEXT NOT NULL,
+    updated_by TEXT NOT NULL,
+    updated_at TEXT NOT NULL
+);
+CREATE TABLE subscriptions (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    guild_id TEXT NOT NULL,
+    user_id TEXT NOT NULL,
+    type TEXT NOT NULL,
+    code TEXT NOT NULL,
+    created_at TEXT NOT NULL,
+    UNIQUE (guild_id, user_id, type, code)
+);
+CREATE TABLE notification_log (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    subscription_id INTEGER NOT NULL,
+    flight_id TEXT NOT NULL,
+    notified_at TEXT NOT NULL,
+    UNIQUE (subscription_id, flight_id)
+);
+CREATE TABLE usage_cache (
+    id INTEGER PRIMARY KEY CHECK (id = 1),
+    payload TEXT NOT NULL,
+    fetched_at TEXT NOT NULL
+);
+"""
+
+
+def _status_counts(conn, capsys, exact=False) -> dict[str, str]:
+    args = argparse.Namespace(exact=exact, verbose=False, limit=20)
+    admin.cmd_status(conn, args)
+    line = next(
+        line for line in capsys.readouterr().out.splitlines() if line.startswith("Counts:")
+    )
+    return dict(re.findall(r"(\w+)=(~?\d+)", line))
+
+
+def _add_logs(conn, start: int, count: int) -> None:
+    conn.executemany(
+        "INSERT INTO notification_log (subscription_id, flight_id, notified_at) VALUES (?, ?, ?)",
+        ((i % 30 + 1, f"f{i}", f"2024-01-01T00:00:{i % 60:02d}") for i in range(start, start + count)),
+    )
+
+
+def test_status_estimates_follow_inserts_and_deletes(tmp_path, capsys):
+    path = str(tmp_path / "bot.db")
+    with sqlite3.connect(path) as setup:
+        setup.executescript(_CORE_SCHEMA)
+        setup.executemany(
+            "INSERT INTO subscriptions (guild_id, user_id, type, code, created_at) VALUES ('1', ?, 'aircraft', 'A320', '2024')",
+            ((str(i),) for i in range(30)),
+        )
+        _add_logs(setup, 0, 1000)
+        setup.execute("ANALYZE")
+    setup.close()
+
+    conn = admin._connect(path)
+    try:
+        counts = _status_counts(conn, capsys)
+        assert counts["subscriptions"] == "~30"
+        assert counts["notification_log"] == "~1000"
+
+        _add_logs(conn, 1000, 5000)
+        conn.execute("DELETE FROM subscriptions WHERE id > 5")
+
+        counts = _status_counts(conn, capsys)
+        assert counts["subscriptions"] == "~5"
+        estimate = int(counts["notification_log"].lstrip("~"))
+        assert 3000 <= estimate <= 12000
+
+        exact = _status_counts(conn, capsys, exact=True)
+        assert exact["subscriptions"] == "5"
+        assert exact["notification_log"] == "6000"
+    finally:
+        conn.close()